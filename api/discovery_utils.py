@@ -0,0 +1,212 @@
+"""
+Helpers shared by the master and simplified discovery workflows
+"""
+
+from typing import Dict, List, Optional
+from langchain_core.messages import HumanMessage
+from loguru import logger
+import json
+import os
+import re
+import hashlib
+import threading
+from concurrent.futures import Future
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# ===== LLM RESPONSE CACHE =====
+LLM_CACHE_TTL = 7 * 24 * 3600  # Extraction output is stable for a given prompt
+
+try:
+    import diskcache as dc
+    llm_cache = dc.Cache(os.getenv("LLM_CACHE_DIR", "data/cache/llm"), size_limit=50_000_000)
+except Exception as e:
+    logger.warning(f"LLM cache unavailable - extraction results will not be cached: {e}")
+    llm_cache = None
+
+# Calls currently waiting on OpenAI, so concurrent agents with the same prompt share one request
+_INFLIGHT_LLM_CALLS: Dict[str, Future] = {}
+_INFLIGHT_LLM_LOCK = threading.Lock()
+
+
+# ===== ADDRESS SIGNALS =====
+# Cheap signals that a page mentions a physical address - pages without any skip the LLM
+ADDRESS_RE = re.compile(
+    r"\b\d{1,5}\s+\w+\s+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Way|"
+    r"Parkway|Pkwy|Suite|Strasse|Straße|Calle|Rue|Via)\b"
+    r"|\b\d{5}(?:-\d{4})?\b"
+    r"|\b[A-Z]{1,2}\d[A-Z\d]?\s?\d[A-Z]{2}\b",
+    re.IGNORECASE
+)
+COUNTRY_RE = re.compile(
+    r"\b(?:" + "|".join([
+        'United States', 'USA', 'Canada', 'Mexico', 'Brazil', 'Argentina',
+        'Chile', 'Colombia', 'Peru', 'United Kingdom', 'UK', 'England', 'Scotland',
+        'Ireland', 'France', 'Germany', 'Netherlands', 'Belgium', 'Luxembourg',
+        'Switzerland', 'Austria', 'Italy', 'Spain', 'Portugal', 'Sweden', 'Norway',
+        'Denmark', 'Finland', 'Poland', 'Czech Republic', 'Hungary', 'Romania',
+        'Greece', 'Turkey', 'Israel', 'United Arab Emirates', 'UAE', 'Saudi Arabia',
+        'Qatar', 'Egypt', 'South Africa', 'Nigeria', 'Kenya', 'India', 'China',
+        'Hong Kong', 'Taiwan', 'Japan', 'South Korea', 'Korea', 'Singapore',
+        'Malaysia', 'Thailand', 'Vietnam', 'Indonesia', 'Philippines', 'Australia',
+        'New Zealand'
+    ]) + r")\b",
+    re.IGNORECASE
+)
+# City gazetteer: pages that only name a city ("offices in Austin and Denver") are what the
+# city-in-content validator keeps, so they must reach the LLM. Case-sensitive, as place names are capitalized.
+CITY_RE = re.compile(
+    r"\b(?:" + "|".join([
+        # US states
+        'Alabama', 'Alaska', 'Arizona', 'Arkansas', 'California', 'Colorado', 'Connecticut',
+        'Delaware', 'Florida', 'Georgia', 'Hawaii', 'Idaho', 'Illinois', 'Indiana', 'Iowa',
+        'Kansas', 'Kentucky', 'Louisiana', 'Maine', 'Maryland', 'Massachusetts', 'Michigan',
+        'Minnesota', 'Mississippi', 'Missouri', 'Montana', 'Nebraska', 'Nevada', 'New Hampshire',
+        'New Jersey', 'New Mexico', 'New York', 'North Carolina', 'North Dakota', 'Ohio',
+        'Oklahoma', 'Oregon', 'Pennsylvania', 'Rhode Island', 'South Carolina', 'South Dakota',
+        'Tennessee', 'Texas', 'Utah', 'Vermont', 'Virginia', 'Washington', 'West Virginia',
+        'Wisconsin', 'Wyoming',
+        # North America
+        'Atlanta', 'Austin', 'Baltimore', 'Boise', 'Boston', 'Charlotte', 'Chicago', 'Cincinnati',
+        'Cleveland', 'Columbus', 'Dallas', 'Denver', 'Detroit', 'Fort Worth', 'Honolulu', 'Houston',
+        'Indianapolis', 'Jacksonville', 'Kansas City', 'Las Vegas', 'Los Angeles', 'Louisville',
+        'Memphis', 'Miami', 'Milwaukee', 'Minneapolis', 'Nashville', 'New Orleans', 'Oakland',
+        'Oklahoma City', 'Omaha', 'Orlando', 'Philadelphia', 'Phoenix', 'Pittsburgh', 'Portland',
+        'Raleigh', 'Richmond', 'Sacramento', 'Salt Lake City', 'San Antonio', 'San Diego',
+        'San Francisco', 'San Jose', 'Santa Clara', 'Seattle', 'St. Louis', 'Tampa', 'Tucson',
+        'Calgary', 'Edmonton', 'Montreal', 'Ottawa', 'Toronto', 'Vancouver', 'Winnipeg',
+        'Guadalajara', 'Mexico City', 'Monterrey',
+        # Latin America
+        'Bogota', 'Bogotá', 'Buenos Aires', 'Lima', 'Medellin', 'Medellín', 'Rio de Janeiro',
+        'Santiago', 'Sao Paulo', 'São Paulo', 'Montevideo', 'Panama City', 'San Juan',
+        # Europe
+        'Amsterdam', 'Antwerp', 'Athens', 'Barcelona', 'Belfast', 'Berlin', 'Birmingham',
+        'Bratislava', 'Brussels', 'Bucharest', 'Budapest', 'Cologne', 'Copenhagen', 'Dublin',
+        'Dusseldorf', 'Düsseldorf', 'Edinburgh', 'Eindhoven', 'Frankfurt', 'Geneva', 'Glasgow',
+        'Gothenburg', 'Hamburg', 'Helsinki', 'Istanbul', 'Kiev', 'Kyiv', 'Krakow', 'Lisbon',
+        'Leeds', 'Liverpool', 'London', 'Lyon', 'Madrid', 'Manchester', 'Marseille', 'Milan',
+        'Munich', 'Oslo', 'Paris', 'Porto', 'Prague', 'Rome', 'Rotterdam', 'Stockholm',
+        'Stuttgart', 'Tallinn', 'The Hague', 'Turin', 'Valencia', 'Vienna', 'Vilnius', 'Warsaw',
+        'Zurich', 'Zürich',
+        # Middle East and Africa
+        'Abu Dhabi', 'Accra', 'Cairo', 'Cape Town', 'Casablanca', 'Doha', 'Dubai',
+        'Johannesburg', 'Lagos', 'Nairobi', 'Riyadh', 'Tel Aviv',
+        # Asia Pacific
+        'Auckland', 'Bangalore', 'Bengaluru', 'Bangkok', 'Beijing', 'Brisbane', 'Chennai',
+        'Delhi', 'New Delhi', 'Guangzhou', 'Gurgaon', 'Gurugram', 'Hanoi', 'Ho Chi Minh City',
+        'Hyderabad', 'Jakarta', 'Karachi', 'Kolkata', 'Kuala Lumpur', 'Manila', 'Melbourne',
+        'Mumbai', 'Nagoya', 'Noida', 'Osaka', 'Perth', 'Pune', 'Seoul', 'Shanghai', 'Shenzhen',
+        'Sydney', 'Taipei', 'Tokyo', 'Wellington'
+    ]) + r")\b"
+)
+
+
+def contains_address_signals(text: str) -> bool:
+    """Check whether text has any street, postal code, country or known city mention"""
+    text = text or ''
+    return bool(ADDRESS_RE.search(text) or COUNTRY_RE.search(text) or CITY_RE.search(text))
+
+
+# ===== LLM EXTRACTION =====
+def invoke_llm_cached(llm, prompt: str, json_mode: bool = False, ttl: int = LLM_CACHE_TTL) -> str:
+    """Invoke the LLM, reusing the cached response for an identical prompt"""
+    # The prompt embeds company, content and template, so it fully determines the output
+    key_source = f"{getattr(llm, 'model_name', '')}||{json_mode}||{prompt}"
+    key = hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+    
+    if llm_cache is not None:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    with _INFLIGHT_LLM_LOCK:
+        future = _INFLIGHT_LLM_CALLS.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _INFLIGHT_LLM_CALLS[key] = Future()
+    
+    if not is_owner:
+        return future.result()
+    
+    try:
+        if json_mode:
+            # OpenAI JSON mode guarantees a syntactically valid JSON object
+            llm = llm.bind(response_format={"type": "json_object"})
+        
+        content = llm.invoke([HumanMessage(content=prompt)]).content
+        
+        # Cache before releasing the in-flight entry so late callers hit one or the other
+        if llm_cache is not None:
+            try:
+                llm_cache.set(key, content, expire=ttl)
+            except Exception as e:
+                logger.warning(f"Failed to cache LLM response: {e}")
+        
+        future.set_result(content)
+        return content
+    
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    
+    finally:
+        with _INFLIGHT_LLM_LOCK:
+            _INFLIGHT_LLM_CALLS.pop(key, None)
+
+
+def parse_llm_locations(content: str) -> List[Dict]:
+    """Parse the {"locations": [...]} object returned by a JSON-mode extraction"""
+    try:
+        # orjson decodes UTF-8 directly and is several times faster than the stdlib parser
+        data = orjson.loads(content) if orjson else json.loads(content)
+    except (TypeError, ValueError):
+        # Salvage a bare array wrapped in prose or code fences
+        json_array = find_json_array(content) if isinstance(content, str) else None
+        try:
+            data = json.loads(json_array) if json_array else []
+        except ValueError:
+            return []
+    
+    if isinstance(data, dict):
+        data = data.get('locations', [])
+    
+    if not isinstance(data, list):
+        return []
+    
+    return [loc for loc in data if isinstance(loc, dict)]
+
+
+def find_json_array(text: str) -> Optional[str]:
+    """Return the first complete top-level JSON array in text, matching brackets in one pass"""
+    start = text.find('[') if text else -1
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape = False
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return None
@@ -107,19 +107,23 @@ def create_workflow_with_cache(api_keys: dict, output_dir: str = "temp/output"):
     if not WORKFLOW_AVAILABLE:
         logger.warning("Using fallback workflow due to import issues")
     
-    # Create a cache key based on provided API keys (not their values for security)
-    key_types = tuple(sorted([k for k, v in api_keys.items() if v]))
-    cache_key = f"workflow_{hash(key_types)}"
-    
-    # Always create new instance for now (caching workflow instances is complex due to state)
     return SuperEnhancedDiscoveryWorkflow(
         output_dir=output_dir,
         api_keys=api_keys
     )
 
+def company_cache_key(company_name: str, company_url: str = None) -> str:
+    """Canonical key so case/whitespace/URL-form variants of a company share results"""
+    name = ' '.join((company_name or '').lower().split()).replace(' ', '_')
+    url = (company_url or '').strip().lower()
+    for prefix in ('https://', 'http://', 'www.'):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+    return f"company_{name}_{url.rstrip('/')}"
+
 def get_cached_company_result(company_name: str, company_url: str = None):
     """Check if we have cached results for this company"""
-    cache_key = f"company_{company_name.lower().replace(' ', '_')}_{hash(company_url or '')}"
+    cache_key = company_cache_key(company_name, company_url)
     if CACHE_AVAILABLE and hasattr(cache, 'get'):
         return cache.get(cache_key)
     else:
@@ -127,7 +131,7 @@ def get_cached_company_result(company_name: str, company_url: str = None):
 
 def cache_company_result(company_name: str, company_url: str, result: dict, ttl: int = 3600):
     """Cache company discovery results for 1 hour by default"""
-    cache_key = f"company_{company_name.lower().replace(' ', '_')}_{hash(company_url or '')}"
+    cache_key = company_cache_key(company_name, company_url)
     try:
         if CACHE_AVAILABLE and hasattr(cache, 'set'):
             cache.set(cache_key, result, expire=ttl)
@@ -585,6 +589,10 @@ async def clear_cache():
             cache.clear()
         elif isinstance(cache, dict):
             cache.clear()
+        # Checkpointed runs would otherwise resume from the results being cleared
+        clear_checkpoints = getattr(SuperEnhancedDiscoveryWorkflow, 'clear_checkpoints', None)
+        if clear_checkpoints is not None:
+            await asyncio.to_thread(clear_checkpoints)
         return {"message": "Cache cleared successfully"}
     except Exception as e:
         logger.error(f"Cache clear error: {e}")
@@ -636,17 +644,19 @@ async def process_single_company(
         jobs_storage[job_id]["progress"] = 20
         jobs_storage[job_id]["message"] = "Starting multi-agent workflow..."
         
-        # Create workflow instance  
-        workflow = SuperEnhancedDiscoveryWorkflow(
-            output_dir="temp/output",
-            api_keys=workflow_api_keys
+        # Create workflow instance (off the event loop - node setup builds API clients)
+        workflow = await asyncio.to_thread(
+            create_workflow_with_cache,
+            api_keys=workflow_api_keys,
+            output_dir="temp/output"
         )
         
         jobs_storage[job_id]["progress"] = 30
         jobs_storage[job_id]["message"] = "Running enhanced multi-agent discovery (Google Maps, Tavily, Web Scraper, SEC, Multi-Search, Industry-specific, Directory agents)..."
         
-        # Run the real discovery workflow
-        result = workflow.discover(
+        # Run the real discovery workflow in a worker thread so the API stays responsive
+        result = await asyncio.to_thread(
+            workflow.discover,
             company_name=company_name,
             company_url=company_url
         )
@@ -747,11 +757,15 @@ async def process_batch_companies(
             'tavily_api_key': api_keys.tavily_api_key
         }
         
-        workflow = SuperEnhancedDiscoveryWorkflow(
-            output_dir="temp/output",
-            api_keys=workflow_api_keys
+        workflow = await asyncio.to_thread(
+            create_workflow_with_cache,
+            api_keys=workflow_api_keys,
+            output_dir="temp/output"
         )
         
+        # Results keyed by canonical company so duplicates in a batch run only once
+        results_by_key = {}
+        
         for i, company in enumerate(companies):
             progress = int((i / total_companies) * 90)  # Reserve 10% for final processing
             jobs_storage[job_id]["progress"] = progress
@@ -759,9 +773,29 @@ async def process_batch_companies(
             
             logger.info(f"Batch job {job_id}: Processing company {i+1}/{total_companies}: {company.company_name}")
             
+            company_key = company_cache_key(company.company_name, company.company_url)
+            reused_result = results_by_key.get(company_key) or get_cached_company_result(
+                company.company_name, company.company_url
+            )
+            if reused_result:
+                logger.info(f"Batch job {job_id}: Reusing results for {company.company_name}")
+                company_result = {
+                    "company_name": company.company_name,
+                    "company_url": company.company_url,
+                    "locations": reused_result.get('locations', []),
+                    "summary": reused_result.get('summary', {}),
+                    "enhancement_summary": reused_result.get('enhancement_summary', {}),
+                    "messages": reused_result.get('messages', []),
+                    "errors": reused_result.get('errors', [])
+                }
+                results_by_key[company_key] = company_result
+                all_results.append(company_result)
+                continue
+            
             try:
-                # Run the real workflow for each company
-                result = workflow.discover(
+                # Run the real workflow for each company without blocking the event loop
+                result = await asyncio.to_thread(
+                    workflow.discover,
                     company_name=company.company_name,
                     company_url=company.company_url
                 )
@@ -797,6 +831,10 @@ async def process_batch_companies(
                     "errors": result.get('errors', [])
                 }
                 
+                results_by_key[company_key] = company_result
+                if not company_result["errors"]:
+                    cache_company_result(company.company_name, company.company_url, company_result, ttl=3600)
+                
             except Exception as company_error:
                 logger.error(f"Error processing {company.company_name}: {company_error}")
                 company_result = {
@@ -3,22 +3,57 @@ Enhanced LangGraph Multi-Agent Workflow with Maximum Location Discovery
 Significantly improved to find 3-5x more locations through multiple strategies
 """
 
-from typing import Dict, List, TypedDict, Annotated, Sequence
+from typing import Dict, List, Optional, TypedDict, Annotated, Sequence
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
 import operator
 from loguru import logger
 import json
+import csv
 import os
 from datetime import datetime
-import pandas as pd
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
 from bs4 import BeautifulSoup
+from lxml import etree
+from io import BytesIO
 import time
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, urldefrag
 import re
+import string
+import hashlib
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from discovery_utils import contains_address_signals, invoke_llm_cached, parse_llm_locations
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import xlsxwriter  # noqa: F401 - only probed so pandas can use the faster writer
+    EXCEL_ENGINE = 'xlsxwriter'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    logger.warning("selectolax not installed - falling back to BeautifulSoup for page parsing")
+    HTMLParser = None
+    SELECTOLAX_AVAILABLE = False
 
 
 # ===== STATE DEFINITION =====
@@ -39,6 +74,7 @@ class DiscoveryState(TypedDict):
     
     # Processing stages
     all_locations: List[Dict]
+    sources_used: Dict[str, int]
     deduplicated_locations: List[Dict]
     enriched_locations: List[Dict]
     
@@ -55,6 +91,7 @@ class DiscoveryState(TypedDict):
 
 
 # ===== UTILITY FUNCTIONS =====
+@lru_cache(maxsize=4096)
 def clean_and_validate_url(url: str) -> str:
     """Clean and validate URL with better handling"""
     if not url:
@@ -82,11 +119,146 @@ def clean_and_validate_url(url: str) -> str:
     return ""
 
 
+NON_ALPHANUMERIC_RE = re.compile(r'[\W_]+')
+
+
+def canonicalize(value, length: int = None) -> str:
+    """Lowercase and drop punctuation/whitespace so near-identical strings share a key"""
+    canonical = NON_ALPHANUMERIC_RE.sub('', str(value or '').lower())
+    return canonical[:length] if length else canonical
+
+
+@lru_cache(maxsize=8)
+def get_llm(api_key: str = None) -> ChatOpenAI:
+    """Shared gpt-4o-mini client, one per API key, so nodes reuse a single connection pool"""
+    return ChatOpenAI(
+        temperature=0,
+        model="gpt-4o-mini",
+        api_key=api_key,
+        # Sized for every agent calling concurrently, with keep-alive to api.openai.com
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=60
+        )
+    )
+
+
+def create_pooled_session(headers: Dict = None, pool_size: int = 32) -> requests.Session:
+    """Create a keep-alive session whose pool can serve all concurrent workers"""
+    session = requests.Session()
+    # Retries are handled by get_with_backoff, not the adapter
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    
+    if headers:
+        session.headers.update(headers)
+    
+    return session
+
+
+class RateLimiter:
+    """Thread-safe token bucket for pacing calls to rate-limited APIs"""
+    
+    def __init__(self, rate: float, per: float = 1.0, burst: int = 1):
+        self.rate = rate
+        self.per = per
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate / self.per)
+                self._last = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) * self.per / self.rate
+            
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """Routes each request to its host's token bucket; unknown hosts are not throttled"""
+    
+    def __init__(self, limiters: Dict[str, RateLimiter]):
+        self.limiters = limiters
+    
+    def acquire(self, url: str):
+        """Block until the host of url may be called again"""
+        limiter = self.limiters.get(urlparse(url).netloc)
+        if limiter:
+            limiter.acquire()
+
+
+# Module-level so the budgets hold across nodes, workflow instances and batches.
+# SEC allows 10 requests/second across all of its hosts; DuckDuckGo throttles aggressively.
+_sec_rate_limiter = RateLimiter(rate=10, per=1.0, burst=10)
+HOST_RATE_LIMITER = HostRateLimiter({
+    'duckduckgo.com': RateLimiter(rate=1, per=1.0, burst=3),
+    'www.sec.gov': _sec_rate_limiter,
+    'data.sec.gov': _sec_rate_limiter
+})
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_duckduckgo_snippets(html: str, limit: int) -> List[str]:
+    """Return the snippet text of the top DuckDuckGo results"""
+    if SELECTOLAX_AVAILABLE:
+        # Modest C parser - an order of magnitude faster than building a BeautifulSoup tree
+        snippets = (result.css_first('div.snippet') for result in HTMLParser(html).css('div.result')[:limit])
+        return [snippet.text(separator=' ', strip=True) for snippet in snippets if snippet]
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    snippets = (result.find('div', class_='snippet') for result in soup.find_all('div', class_='result')[:limit])
+    return [snippet.get_text(separator=' ', strip=True) for snippet in snippets if snippet]
+
+
+def get_with_backoff(session: requests.Session, url: str, retries: int = 3, base: float = 1.0,
+                     jitter: float = 0.5, max_wait: float = 30.0, **kwargs) -> requests.Response:
+    """GET under the host rate limit, retrying throttled and 5xx responses with exponential backoff"""
+    for attempt in range(retries + 1):
+        HOST_RATE_LIMITER.acquire(url)
+        response = session.get(url, **kwargs)
+        
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        
+        # Honour Retry-After (seconds form) when the server sends one
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            wait = float(retry_after)
+        else:
+            wait = base * 2 ** attempt + random.uniform(0, jitter)
+        wait = min(wait, max_wait)
+        
+        logger.warning(f"{urlparse(url).netloc} returned {response.status_code}, retrying in {wait:.1f}s")
+        response.close()  # Release the pooled connection, streamed responses hold it until closed
+        time.sleep(wait)
+    
+    return response
+
+
 # ===== ENHANCED AGENT NODES =====
 
 class SuperEnhancedGoogleMapsAgentNode:
     """Google Maps agent with more comprehensive search"""
     
+    # Places API comfortably handles this many in-flight requests per key
+    MAX_CONCURRENT_REQUESTS = 10
+    
+    # Only the contact fields are read from details; the text search supplies the rest
+    DETAIL_FIELDS = ['formatted_phone_number', 'website']
+    
     def __init__(self, api_key: str = None):
         try:
             import googlemaps
@@ -129,40 +301,38 @@ class SuperEnhancedGoogleMapsAgentNode:
                 f"{company_name} location"
             ]
             
-            for pattern in search_patterns[:3]:  # Limit to avoid API costs
-                try:
-                    places_result = self.client.places(query=pattern, type=None)
-                    
-                    for place in places_result.get('results', [])[:15]:  # Increased from 20
-                        place_id = place.get('place_id')
-                        
-                        # Try to get detailed info
-                        details = {}
-                        if place_id:
-                            try:
-                                details = self.client.place(place_id)['result']
-                            except:
-                                pass
-                        
-                        location = {
-                            'name': place.get('name', ''),
-                            'address': place.get('formatted_address', ''),
-                            'city': self._extract_city(place.get('formatted_address', '')),
-                            'phone': details.get('formatted_phone_number', ''),
-                            'website': details.get('website', ''),
-                            'lat': place.get('geometry', {}).get('location', {}).get('lat'),
-                            'lng': place.get('geometry', {}).get('location', {}).get('lng'),
-                            'confidence': 0.9,
-                            'source': 'google_maps',
-                            'search_pattern': pattern
-                        }
-                        all_locations.append(location)
-                    
-                    time.sleep(0.5)  # Rate limiting between searches
-                    
-                except Exception as e:
-                    logger.error(f"Google Maps search error for '{pattern}': {e}")
-                    continue
+            patterns = search_patterns[:3]  # Limit to avoid API costs
+            
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+                # Text searches are independent of each other
+                pattern_results = list(executor.map(self._search_pattern, patterns))
+                
+                places = [
+                    (pattern, place)
+                    for pattern, results in zip(patterns, pattern_results)
+                    for place in results[:15]  # Increased from 20
+                ]
+                
+                # Fetch details once per place, even if several patterns returned it
+                place_ids = list({place.get('place_id') for _, place in places if place.get('place_id')})
+                details_by_id = dict(zip(place_ids, executor.map(self._get_place_details, place_ids)))
+            
+            for pattern, place in places:
+                details = details_by_id.get(place.get('place_id'), {})
+                
+                location = {
+                    'name': place.get('name', ''),
+                    'address': place.get('formatted_address', ''),
+                    'city': self._extract_city(place.get('formatted_address', '')),
+                    'phone': details.get('formatted_phone_number', ''),
+                    'website': details.get('website', ''),
+                    'lat': place.get('geometry', {}).get('location', {}).get('lat'),
+                    'lng': place.get('geometry', {}).get('location', {}).get('lng'),
+                    'confidence': 0.9,
+                    'source': 'google_maps',
+                    'search_pattern': pattern
+                }
+                all_locations.append(location)
             
             # Remove duplicates based on address
             unique_locations = self._deduplicate_gmaps_results(all_locations)
@@ -179,6 +349,21 @@ class SuperEnhancedGoogleMapsAgentNode:
         
         return state
     
+    def _search_pattern(self, pattern: str) -> List[Dict]:
+        """Run a single text search and return its raw place results"""
+        try:
+            return self.client.places(query=pattern, type=None).get('results', [])
+        except Exception as e:
+            logger.error(f"Google Maps search error for '{pattern}': {e}")
+            return []
+    
+    def _get_place_details(self, place_id: str) -> Dict:
+        """Try to get detailed info for a place"""
+        try:
+            return self.client.place(place_id, fields=self.DETAIL_FIELDS)['result']
+        except:
+            return {}
+    
     def _extract_city(self, address: str) -> str:
         parts = address.split(',')
         if len(parts) >= 3:
@@ -191,7 +376,7 @@ class SuperEnhancedGoogleMapsAgentNode:
         unique = []
         
         for loc in locations:
-            address_key = (loc.get('address') or '').lower()[:50]  # First 50 chars
+            address_key = canonicalize(loc.get('address'), 50)  # First 50 chars
             if address_key and address_key not in seen_addresses:
                 seen_addresses.add(address_key)
                 unique.append(loc)
@@ -202,6 +387,10 @@ class SuperEnhancedGoogleMapsAgentNode:
 class SuperEnhancedTavilySearchAgentNode:
     """Tavily search with multiple targeted queries"""
     
+    # Shared across instances so concurrent jobs respect the same Tavily budget; one query a second,
+    # with no burst, so the five queries are spaced out rather than sent at once
+    rate_limiter = RateLimiter(rate=1, per=1.0, burst=1)
+    
     def __init__(self, tavily_api_key: str = None):
         self.api_key = tavily_api_key or os.getenv("TAVILY_API_KEY")
         logger.info(f"Tavily API key provided: {'Yes' if self.api_key else 'No'}")
@@ -222,11 +411,7 @@ class SuperEnhancedTavilySearchAgentNode:
             self.search = None
         
         try:
-            self.llm = ChatOpenAI(
-                temperature=0,
-                model="gpt-4o-mini",
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
             self.llm = None
@@ -247,8 +432,6 @@ class SuperEnhancedTavilySearchAgentNode:
         logger.info(f"Tavily: Enhanced search for {company_name}")
         
         try:
-            all_locations = []
-            
             # Multiple targeted search queries for better coverage
             search_queries = [
                 f"{company_name} office locations addresses contact",
@@ -261,23 +444,13 @@ class SuperEnhancedTavilySearchAgentNode:
                 f"{company_name} real estate leases office space facilities"
             ]
             
-            for query in search_queries[:5]:  # Process first 5 queries
-                try:
-                    logger.info(f"Tavily: Searching '{query}'")
-                    results = self.search.invoke(query)
-                    
-                    for result in results[:2]:  # Process first 2 results per query
-                        content = result.get('content', '')[:3000]  # Increased content length
-                        
-                        if len(content) > 100:
-                            locations = self._extract_locations_with_llm(content, company_name, query)
-                            all_locations.extend(locations)
-                    
-                    time.sleep(1)  # Rate limiting between queries
-                    
-                except Exception as e:
-                    logger.error(f"Tavily search error for '{query}': {e}")
-                    continue
+            # Process first 5 queries concurrently; the token bucket paces the API
+            queries = search_queries[:5]
+            with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+                documents = [doc for docs in executor.map(self._search_query, queries) for doc in docs]
+            
+            # One extraction call across all snippets instead of one per snippet
+            all_locations = self._extract_locations_with_llm(documents, company_name) if documents else []
             
             # Remove duplicates
             unique_locations = self._deduplicate_tavily_results(all_locations)
@@ -294,15 +467,37 @@ class SuperEnhancedTavilySearchAgentNode:
         
         return state
     
-    def _extract_locations_with_llm(self, content: str, company_name: str, query: str) -> List[Dict]:
-        """Enhanced LLM extraction with better prompting"""
+    def _search_query(self, query: str) -> List[Dict]:
+        """Run a single rate-limited Tavily query and return usable snippets"""
+        documents = []
         
-        prompt = f"""CRITICAL: Extract ONLY real, specific locations for {company_name} from this content.
-
-Search Query Context: {query}
+        try:
+            self.rate_limiter.acquire()
+            logger.info(f"Tavily: Searching '{query}'")
+            results = self.search.invoke(query)
+            
+            for result in results[:2]:  # Process first 2 results per query
+                content = result.get('content', '')[:3000]  # Increased content length
+                
+                if len(content) > 100:
+                    documents.append({'query': query, 'content': content})
+        
+        except Exception as e:
+            logger.error(f"Tavily search error for '{query}': {e}")
+        
+        return documents
+    
+    def _extract_locations_with_llm(self, documents: List[Dict], company_name: str) -> List[Dict]:
+        """Enhanced LLM extraction over all search snippets in a single call"""
+        
+        documents_block = "\n\n".join(
+            f"[Document {i}]\nSearch Query Context: {doc['query']}\n\nContent:\n{doc['content']}"
+            for i, doc in enumerate(documents, 1)
+        )
+        
+        prompt = f"""CRITICAL: Extract ONLY real, specific locations for {company_name} from these search results.
 
-Content:
-{content}
+{documents_block}
 
 STRICT REQUIREMENTS:
 1. ONLY extract locations explicitly mentioned in the text with real addresses or cities
@@ -312,6 +507,7 @@ STRICT REQUIREMENTS:
 5. Include facility types (office, warehouse, manufacturing, etc.) if mentioned
 
 For each REAL location found, extract:
+- document: Number of the document the location was found in
 - name: Specific location/facility name
 - address: Full street address (if available)
 - city: City name (must be mentioned in text)
@@ -319,33 +515,46 @@ For each REAL location found, extract:
 - country: Country (if mentioned)
 - facility_type: Type of facility (office, warehouse, etc.)
 
-Return JSON array. If no specific locations found, return []
+Return a JSON object of the form {{"locations": [...]}}. If no specific locations found, return {{"locations": []}}
 """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response_content = invoke_llm_cached(self.llm, prompt, json_mode=True)
             
-            json_match = re.search(r'\[.*?\]', response.content, re.DOTALL)
-            if json_match:
-                locs = json.loads(json_match.group())
-                validated_locations = []
-                
-                for loc in locs:
-                    if loc and isinstance(loc, dict) and loc.get('city') and len((loc.get('city') or '').strip()) > 1:
-                        # Validate that this isn't a fake location
-                        if self._validate_location_authenticity(loc, content):
-                            loc['source'] = 'tavily'
-                            loc['confidence'] = 0.8
-                            loc['source_query'] = query
-                            validated_locations.append(loc)
-                
-                return validated_locations
+            validated_locations = []
+            
+            for loc in parse_llm_locations(response_content):
+                if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
+                    document = self._resolve_document(loc.pop('document', None), documents)
+                    
+                    # Validate that this isn't a fake location
+                    if self._validate_location_authenticity(loc, document['content']):
+                        loc['source'] = 'tavily'
+                        loc['confidence'] = 0.8
+                        loc['source_query'] = document['query']
+                        validated_locations.append(loc)
+            
+            return validated_locations
                 
         except Exception as e:
             logger.error(f"Tavily LLM extraction error: {e}")
         
         return []
     
+    def _resolve_document(self, document_number, documents: List[Dict]) -> Dict:
+        """Map the LLM's document number back to its snippet, or all snippets if unknown"""
+        try:
+            index = int(document_number)
+            if 1 <= index <= len(documents):
+                return documents[index - 1]
+        except (TypeError, ValueError):
+            pass
+        
+        return {
+            'query': '',
+            'content': ' '.join(doc['content'] for doc in documents)
+        }
+    
     def _validate_location_authenticity(self, location: Dict, content: str) -> bool:
         """Validate that the location appears to be real based on content"""
         if not location or not isinstance(location, dict):
@@ -372,7 +581,7 @@ Return JSON array. If no specific locations found, return []
         unique = []
         
         for loc in locations:
-            key = ((loc.get('city') or '').lower(), (loc.get('name') or '')[:20].lower())
+            key = (canonicalize(loc.get('city')), canonicalize(loc.get('name'), 20))
             if key not in seen and loc.get('city'):
                 seen.add(key)
                 unique.append(loc)
@@ -383,19 +592,55 @@ Return JSON array. If no specific locations found, return []
 class SuperEnhancedWebScraperAgentNode:
     """Massively enhanced web scraping with sitemap discovery and deeper crawling"""
     
+    # Upper bound on simultaneous requests against a single company domain
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # Substring alternations scanned in C - no per-call lowercasing or keyword loop
+    LOCATION_INDICATOR_RE = re.compile(
+        r"address|street|avenue|road|suite|floor|phone|tel|zip|postal|city|state|"
+        r"office|headquarters|facility|location",
+        re.IGNORECASE
+    )
+    LOCATION_URL_RE = re.compile(
+        r"location|office|contact|global|facility|branch|store|career|about|international",
+        re.IGNORECASE
+    )
+    
+    # Only the first few KB of page text are used, so never pull multi-MB bodies
+    MAX_PAGE_BYTES = 512_000
+    MAX_SITEMAP_BYTES = 5_000_000
+    
+    # Massively expanded keywords
+    LOCATION_LINK_KEYWORDS = [
+        'location', 'office', 'contact', 'about', 'global', 'worldwide',
+        'branch', 'store', 'address', 'where', 'find-us', 'find-a',
+        'presence', 'regional', 'facilities', 'locations', 'offices',
+        'careers', 'jobs', 'work-with-us', 'join-us', 'employment',
+        'investor', 'investors', 'relations', 'news', 'press', 'media',
+        'subsidiary', 'subsidiaries', 'division', 'divisions', 
+        'business-unit', 'business-units', 'international', 'global',
+        'americas', 'europe', 'asia', 'africa', 'oceania', 'apac',
+        'manufacturing', 'factory', 'factories', 'plant', 'plants',
+        'warehouse', 'warehouses', 'distribution', 'logistics',
+        'headquarters', 'hq', 'corporate', 'campus', 'center', 'centre',
+        'service', 'services', 'support', 'sales', 'marketing',
+        'operations', 'facilities', 'real-estate', 'properties'
+    ]
+    # All keywords matched in a single pass over each link's text
+    LOCATION_LINK_RE = re.compile('|'.join(map(re.escape, dict.fromkeys(LOCATION_LINK_KEYWORDS))))
+    
+    NOISE_TAGS = ['script', 'style', 'meta', 'noscript', 'header', 'footer']
+    STRUCTURED_TAGS = ['div', 'section', 'article', 'li', 'td', 'address']
+    
     def __init__(self):
         try:
-            self.llm = ChatOpenAI(
-                temperature=0,
-                model="gpt-4o-mini",
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI client: {e}")
             self.llm = None
             
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Pooled keep-alive connections so concurrent page fetches reuse TLS sessions
+        self.session = create_pooled_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         logger.info("Super Enhanced Web Scraper Agent Node initialized")
@@ -430,21 +675,14 @@ class SuperEnhancedWebScraperAgentNode:
             location_urls = self._find_all_location_pages(company_url)
             logger.info(f"Found {len(location_urls)} potential location pages")
             
-            # Step 2: Scrape each page with enhanced extraction
-            for url in location_urls[:25]:  # Increased limit significantly
-                try:
-                    logger.info(f"Scraping: {url}")
-                    response = self.session.get(url, timeout=20)
-                    
-                    if response.status_code == 200:
-                        locations = self._extract_locations_from_page(response.text, company_name, url)
-                        all_locations.extend(locations)
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}")
-                    continue
+            # Step 2: Scrape pages concurrently - bounded pool paces the server
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+                page_results = executor.map(
+                    lambda url: self._scrape_page(url, company_name),
+                    location_urls[:25]  # Increased limit significantly
+                )
+                for locations in page_results:
+                    all_locations.extend(locations)
             
             # Remove duplicates
             unique_locations = self._deduplicate_web_results(all_locations)
@@ -461,6 +699,38 @@ class SuperEnhancedWebScraperAgentNode:
         
         return state
     
+    def _scrape_page(self, url: str, company_name: str) -> List[Dict]:
+        """Fetch a single page and extract its locations"""
+        try:
+            logger.info(f"Scraping: {url}")
+            status_code, html_content = self._get_capped_text(url, 20, self.MAX_PAGE_BYTES)
+            
+            if status_code == 200:
+                return self._extract_locations_from_page(html_content, company_name, url)
+        
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+        
+        return []
+    
+    def _get_capped(self, url: str, timeout: int, max_bytes: int):
+        """GET a URL, reading at most max_bytes of the body"""
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            body = bytearray()
+            
+            if response.status_code == 200:
+                for chunk in response.iter_content(chunk_size=65536):
+                    body.extend(chunk)
+                    if len(body) >= max_bytes:
+                        break
+            
+            return response, bytes(body[:max_bytes])
+    
+    def _get_capped_text(self, url: str, timeout: int, max_bytes: int):
+        """GET a URL with a capped body and decode it as text"""
+        response, body = self._get_capped(url, timeout, max_bytes)
+        return response.status_code, body.decode(response.encoding or 'utf-8', errors='replace')
+    
     def _find_all_location_pages(self, base_url: str) -> List[str]:
         """Comprehensive page discovery including sitemaps"""
         location_urls = [base_url]
@@ -478,12 +748,13 @@ class SuperEnhancedWebScraperAgentNode:
             pattern_urls = self._try_common_location_paths(base_url)
             location_urls.extend(pattern_urls)
             
-            # Remove duplicates while preserving order
+            # Remove duplicates while preserving order (ignoring fragments and trailing slashes)
             seen = set()
             unique_urls = []
             for url in location_urls:
-                if url not in seen:
-                    seen.add(url)
+                key = urldefrag(url)[0].rstrip('/')
+                if key not in seen:
+                    seen.add(key)
                     unique_urls.append(url)
             
         except Exception as e:
@@ -497,26 +768,9 @@ class SuperEnhancedWebScraperAgentNode:
         location_urls = []
         
         try:
-            response = self.session.get(base_url, timeout=15)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Massively expanded keywords
-                location_keywords = [
-                    'location', 'office', 'contact', 'about', 'global', 'worldwide',
-                    'branch', 'store', 'address', 'where', 'find-us', 'find-a',
-                    'presence', 'regional', 'facilities', 'locations', 'offices',
-                    'careers', 'jobs', 'work-with-us', 'join-us', 'employment',
-                    'investor', 'investors', 'relations', 'news', 'press', 'media',
-                    'subsidiary', 'subsidiaries', 'division', 'divisions', 
-                    'business-unit', 'business-units', 'international', 'global',
-                    'americas', 'europe', 'asia', 'africa', 'oceania', 'apac',
-                    'manufacturing', 'factory', 'factories', 'plant', 'plants',
-                    'warehouse', 'warehouses', 'distribution', 'logistics',
-                    'headquarters', 'hq', 'corporate', 'campus', 'center', 'centre',
-                    'service', 'services', 'support', 'sales', 'marketing',
-                    'operations', 'facilities', 'real-estate', 'properties'
-                ]
+            status_code, html_content = self._get_capped_text(base_url, 15, self.MAX_PAGE_BYTES)
+            if status_code == 200:
+                soup = BeautifulSoup(html_content, 'html.parser')
                 
                 for link in soup.find_all('a', href=True):
                     href = (link.get('href') or '').lower()
@@ -526,7 +780,7 @@ class SuperEnhancedWebScraperAgentNode:
                     # Check all attributes
                     all_text = f"{href} {text} {title}"
                     
-                    if any(keyword in all_text for keyword in location_keywords):
+                    if self.LOCATION_LINK_RE.search(all_text):
                         full_url = self._build_full_url(href, base_url)
                         if full_url and self._is_same_domain(full_url, base_url):
                             location_urls.append(full_url)
@@ -536,7 +790,7 @@ class SuperEnhancedWebScraperAgentNode:
         
         return location_urls[:50]  # Increased limit
     
-    def _discover_sitemap_locations(self, base_url: str) -> List[str]:
+    def _discover_sitemap_locations(self, base_url: str, limit: int = 30) -> List[str]:
         """Discover location pages from sitemaps"""
         location_urls = []
         
@@ -552,15 +806,23 @@ class SuperEnhancedWebScraperAgentNode:
             for path in sitemap_paths:
                 sitemap_url = urljoin(base_url, path)
                 try:
-                    response = self.session.get(sitemap_url, timeout=10)
+                    response, content = self._get_capped(sitemap_url, 10, self.MAX_SITEMAP_BYTES)
                     if response.status_code == 200:
-                        # Parse XML sitemap
-                        soup = BeautifulSoup(response.content, 'xml')
-                        
-                        for loc in soup.find_all('loc'):
-                            url = (loc.get_text() or '').strip()
-                            if url and self._looks_like_location_page(url):
-                                location_urls.append(url)
+                        # Stream <loc> elements instead of building the whole tree
+                        try:
+                            for _, loc in etree.iterparse(
+                                BytesIO(content), tag='{*}loc',
+                                resolve_entities=False, no_network=True
+                            ):
+                                url = (loc.text or '').strip()
+                                loc.clear()
+                                
+                                if url and self._looks_like_location_page(url):
+                                    location_urls.append(url)
+                                    if len(location_urls) >= limit:
+                                        break
+                        except etree.XMLSyntaxError:
+                            pass  # Body was truncated at the size cap - keep what was parsed
                         
                         break  # Found working sitemap
                 except:
@@ -569,7 +831,7 @@ class SuperEnhancedWebScraperAgentNode:
         except Exception as e:
             logger.error(f"Sitemap discovery error: {e}")
         
-        return location_urls[:30]
+        return location_urls[:limit]
     
     def _try_common_location_paths(self, base_url: str) -> List[str]:
         """Try common URL patterns for location pages"""
@@ -582,47 +844,42 @@ class SuperEnhancedWebScraperAgentNode:
             '/facilities', '/branches', '/stores', '/find-us'
         ]
         
-        for path in common_paths:
+        def probe(path):
+            url = urljoin(base_url, path)
             try:
-                url = urljoin(base_url, path)
                 response = self.session.head(url, timeout=5)
                 if response.status_code == 200:
-                    location_urls.append(url)
+                    return url
             except:
-                continue
+                pass
+            return None
+        
+        # Probe all paths at once; map() keeps the original path order
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            for url in executor.map(probe, common_paths):
+                if url:
+                    location_urls.append(url)
         
         return location_urls
     
     def _looks_like_location_page(self, url: str) -> bool:
         """Check if URL looks like a location page"""
-        url_lower = (url or '').lower()
-        location_indicators = [
-            'location', 'office', 'contact', 'global', 'facility',
-            'branch', 'store', 'career', 'about', 'international'
-        ]
-        return any(indicator in url_lower for indicator in location_indicators)
+        return bool(self.LOCATION_URL_RE.search(url or ''))
     
     def _extract_locations_from_page(self, html_content: str, company_name: str, url: str) -> List[Dict]:
         """Enhanced location extraction from page content"""
         locations = []
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove noise
-            for element in soup(['script', 'style', 'meta', 'noscript', 'header', 'footer']):
-                element.decompose()
-            
-            # Get text content
-            text = soup.get_text(separator=' ', strip=True)
+            text, blocks = self._parse_page(html_content)
             
             # Enhanced extraction focusing on structured content
-            structured_content = self._extract_structured_location_content(soup)
+            structured_content = self._extract_structured_location_content(blocks)
             
             # Combine text and structured content
             combined_content = f"{text[:5000]} {structured_content}"
             
-            if len(combined_content) > 100:
+            if len(combined_content) > 100 and contains_address_signals(combined_content):
                 locations = self._extract_locations_with_enhanced_llm(
                     combined_content, company_name, url
                 )
@@ -632,14 +889,41 @@ class SuperEnhancedWebScraperAgentNode:
         
         return locations
     
-    def _extract_structured_location_content(self, soup: BeautifulSoup) -> str:
+    def _parse_page(self, html_content: str):
+        """Parse HTML into page text plus the text of each structural block"""
+        if SELECTOLAX_AVAILABLE:
+            tree = HTMLParser(html_content)
+            
+            # Remove noise
+            for node in tree.css(', '.join(self.NOISE_TAGS)):
+                node.decompose()
+            
+            text = tree.root.text(separator=' ', strip=True) if tree.root else ''
+            blocks = [
+                node.text(separator=' ', strip=True)
+                for node in tree.css(', '.join(self.STRUCTURED_TAGS))
+            ]
+        else:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            
+            # Remove noise
+            for element in soup(self.NOISE_TAGS):
+                element.decompose()
+            
+            text = soup.get_text(separator=' ', strip=True)
+            blocks = [
+                element.get_text(separator=' ', strip=True)
+                for element in soup.find_all(self.STRUCTURED_TAGS)
+            ]
+        
+        return text, blocks
+    
+    def _extract_structured_location_content(self, blocks: List[str]) -> str:
         """Extract structured content that's likely to contain location info"""
         structured_parts = []
         
         # Look for address-like structured content
-        for element in soup.find_all(['div', 'section', 'article', 'li', 'td', 'address']):
-            text = element.get_text(separator=' ', strip=True)
-            
+        for text in blocks:
             # Check if contains location indicators
             if self._contains_location_indicators(text):
                 structured_parts.append(text[:500])
@@ -648,13 +932,7 @@ class SuperEnhancedWebScraperAgentNode:
     
     def _contains_location_indicators(self, text: str) -> bool:
         """Check if text contains location indicators"""
-        text_lower = (text or '').lower()
-        indicators = [
-            'address', 'street', 'avenue', 'road', 'suite', 'floor',
-            'phone', 'tel', 'zip', 'postal', 'city', 'state',
-            'office', 'headquarters', 'facility', 'location'
-        ]
-        return any(indicator in text_lower for indicator in indicators)
+        return bool(self.LOCATION_INDICATOR_RE.search(text or ''))
     
     def _extract_locations_with_enhanced_llm(self, content: str, company_name: str, source_url: str) -> List[Dict]:
         """Enhanced LLM extraction with better validation"""
@@ -681,7 +959,7 @@ STRICT RULES:
 3. Include facility types (office, warehouse, manufacturing, etc.)
 4. Include full addresses when available
 
-Return JSON array with:
+Return a JSON object of the form {{"locations": [...]}} where each location has:
 - name: Location/facility name
 - address: Full street address (if available)
 - city: City name (required)
@@ -690,25 +968,22 @@ Return JSON array with:
 - facility_type: Type (office, warehouse, manufacturing, etc.)
 - postal_code: ZIP/postal code (if available)
 
-Return [] if no locations found.
+Return {{"locations": []}} if no locations found.
 """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response_content = invoke_llm_cached(self.llm, prompt, json_mode=True)
             
-            json_match = re.search(r'\[.*?\]', response.content, re.DOTALL)
-            if json_match:
-                locs = json.loads(json_match.group())
-                validated_locations = []
-                
-                for loc in locs:
-                    if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
-                        loc['source'] = 'company_website'
-                        loc['source_url'] = source_url
-                        loc['confidence'] = 0.85
-                        validated_locations.append(loc)
-                
-                return validated_locations
+            validated_locations = []
+            
+            for loc in parse_llm_locations(response_content):
+                if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
+                    loc['source'] = 'company_website'
+                    loc['source_url'] = source_url
+                    loc['confidence'] = 0.85
+                    validated_locations.append(loc)
+            
+            return validated_locations
         
         except Exception as e:
             logger.error(f"Enhanced LLM extraction error: {e}")
@@ -740,7 +1015,7 @@ Return [] if no locations found.
         unique = []
         
         for loc in locations:
-            key = ((loc.get('city') or '').lower(), (loc.get('address') or '')[:30].lower())
+            key = (canonicalize(loc.get('city')), canonicalize(loc.get('address'), 30))
             if key not in seen and loc.get('city'):
                 seen.add(key)
                 unique.append(loc)
@@ -750,20 +1025,30 @@ Return [] if no locations found.
     def _find_company_website(self, company_name: str) -> str:
         """Try to find company website"""
         try:
-            potential_urls = [
+            # dict.fromkeys drops duplicates (single-word names) while keeping priority order
+            potential_urls = list(dict.fromkeys([
                 f"https://www.{(company_name or '').lower().replace(' ', '')}.com",
                 f"https://{(company_name or '').lower().replace(' ', '')}.com",
                 f"https://www.{(company_name or '').lower().replace(' ', '-')}.com",
                 f"https://{(company_name or '').lower().replace(' ', '-')}.com"
-            ]
+            ]))
             
-            for url in potential_urls:
+            def probe(url):
                 try:
                     response = self.session.head(url, timeout=5, allow_redirects=True)
-                    if response.status_code == 200:
-                        return url
+                    return response.status_code == 200
                 except:
-                    continue
+                    return False
+            
+            # Probe every candidate at once and return the highest-priority hit as soon as it
+            # resolves, without waiting on slower lower-priority probes to time out
+            executor = ThreadPoolExecutor(max_workers=len(potential_urls))
+            try:
+                for url, found in zip(potential_urls, executor.map(probe, potential_urls)):
+                    if found:
+                        return url
+            finally:
+                executor.shutdown(wait=False)
             
             return ""
             
@@ -772,16 +1057,22 @@ Return [] if no locations found.
             return ""
 
 
+# company_tickers.json is ~10MB and changes daily at most, so one download serves every company in a batch
+SEC_TICKERS_TTL = 24 * 3600
+_SEC_TICKERS_CACHE = {'companies': None, 'by_word': None, 'ts': 0}
+_SEC_TICKERS_LOCK = threading.Lock()
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
 class SECFilingsAgentNode:
     """NEW: Extract locations from SEC filings - often contains detailed facility information"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_pooled_session({
             'User-Agent': 'Company Locator Bot research@company.com'  # Required by SEC
         })
         try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except:
             self.llm = None
         logger.info("SEC Filings Agent Node initialized")
@@ -824,27 +1115,56 @@ class SECFilingsAgentNode:
         
         return state
     
+    def _load_sec_tickers(self) -> tuple:
+        """Return the SEC ticker list and its title-word index, refreshing them once a day"""
+        with _SEC_TICKERS_LOCK:
+            if _SEC_TICKERS_CACHE['companies'] is not None and time.time() - _SEC_TICKERS_CACHE['ts'] < SEC_TICKERS_TTL:
+                return _SEC_TICKERS_CACHE['companies'], _SEC_TICKERS_CACHE['by_word']
+            
+            # Use SEC company tickers API (simpler than EDGAR search)
+            tickers_url = "https://www.sec.gov/files/company_tickers.json"
+            response = get_with_backoff(self.session, tickers_url, timeout=15)
+            
+            if response.status_code != 200:
+                return _SEC_TICKERS_CACHE['companies'] or [], _SEC_TICKERS_CACHE['by_word'] or {}
+            
+            # orjson parses the raw bytes several times faster than the stdlib decoder
+            data = orjson.loads(response.content) if orjson else response.json()
+            
+            # Keep (cik, ticker, title) tuples rather than ~13k dicts for the day the cache lives
+            companies = [
+                (item.get('cik_str'), item.get('ticker'), item.get('title') or '')
+                for item in data.values() if isinstance(item, dict)
+            ]
+            del data
+            
+            # Map each title word to the positions of the companies containing it
+            by_word = {}
+            for position, (_, _, title) in enumerate(companies):
+                for word in set(WORD_RE.findall(title.lower())):
+                    by_word.setdefault(word, []).append(position)
+            
+            _SEC_TICKERS_CACHE.update(companies=companies, by_word=by_word, ts=time.time())
+            logger.info(f"SEC: Indexed {len(companies)} company tickers")
+            
+            return companies, by_word
+    
     def _search_sec_company(self, company_name: str) -> Dict:
         """Search for company in SEC database using company tickers API"""
         try:
-            # Use SEC company tickers API (simpler than EDGAR search)
-            tickers_url = "https://www.sec.gov/files/company_tickers.json"
-            response = self.session.get(tickers_url, timeout=15)
+            companies, by_word = self._load_sec_tickers()
             
-            if response.status_code == 200:
-                companies = response.json()
-                
-                # Search for company by name
-                company_lower = (company_name or '').lower()
-                for item in companies.values():
-                    if isinstance(item, dict):
-                        title = (item.get('title') or '').lower()
-                        if any(word in title for word in company_lower.split()[:2]):  # Match first 2 words
-                            return {
-                                'cik': str(item.get('cik_str')),
-                                'ticker': item.get('ticker'),
-                                'title': item.get('title')
-                            }
+            # Search for company by name - match first 2 words, keeping the SEC list order
+            words = WORD_RE.findall((company_name or '').lower())[:2]
+            positions = set().union(*[by_word.get(word, []) for word in words])
+            
+            if positions:
+                cik, ticker, title = companies[min(positions)]
+                return {
+                    'cik': str(cik),
+                    'ticker': ticker,
+                    'title': title
+                }
         
         except Exception as e:
             logger.error(f"SEC company search error: {e}")
@@ -863,32 +1183,51 @@ class SECFilingsAgentNode:
             
             # Get company filings submissions
             submissions_url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
-            response = self.session.get(submissions_url, timeout=15)
+            response = get_with_backoff(self.session, submissions_url, timeout=15, stream=True)
             
             if response.status_code == 200:
-                data = response.json()
+                forms, accession_numbers = self._read_recent_filings(response)
                 
-                # Find latest 10-K filing
-                filings = data.get('filings', {}).get('recent', {})
-                forms = filings.get('form', [])
-                accession_numbers = filings.get('accessionNumber', [])
+                # Find latest 10-K filing - recent filings are listed newest first
+                idx = next((i for i, form in enumerate(forms) if form == '10-K'), None)
+                if idx is None or idx >= len(accession_numbers):
+                    return ""
                 
-                for i, form in enumerate(forms):
-                    if form == '10-K':
-                        accession = accession_numbers[i].replace('-', '')
-                        
-                        # Try to get filing content
-                        filing_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession}/{accession_numbers[i]}-index.htm"
-                        
-                        # For now, return a placeholder - actual SEC filing parsing is complex
-                        # In production, you'd need to parse the actual filing documents
-                        return f"SEC 10-K filing found for {company_data.get('title')} (CIK: {cik})"
+                accession = accession_numbers[idx].replace('-', '')
+                
+                # Try to get filing content
+                filing_url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession}/{accession_numbers[idx]}-index.htm"
+                
+                # For now, return a placeholder - actual SEC filing parsing is complex
+                # In production, you'd need to parse the actual filing documents
+                return f"SEC 10-K filing found for {company_data.get('title')} (CIK: {cik})"
         
         except Exception as e:
             logger.error(f"SEC filing retrieval error: {e}")
         
         return ""
     
+    def _read_recent_filings(self, response: requests.Response) -> tuple:
+        """Read the recent form and accession number arrays from a streamed submissions response"""
+        try:
+            if ijson:
+                # Stop reading once both arrays are in instead of downloading the full filing history
+                response.raw.decode_content = True
+                recent = {}
+                for key, value in ijson.kvitems(response.raw, 'filings.recent'):
+                    if key in ('form', 'accessionNumber'):
+                        recent[key] = value
+                        if len(recent) == 2:
+                            break
+            else:
+                data = orjson.loads(response.content) if orjson else response.json()
+                recent = data.get('filings', {}).get('recent', {})
+            
+            return recent.get('form', []), recent.get('accessionNumber', [])
+        
+        finally:
+            response.close()
+    
     def _extract_locations_from_filing(self, content: str, company_name: str) -> List[Dict]:
         """Extract facility locations from SEC filing content"""
         # For this implementation, return empty since actual SEC parsing is complex
@@ -900,13 +1239,35 @@ class SECFilingsAgentNode:
 class MultiSearchEngineAgentNode:
     """NEW: Use multiple search engines for comprehensive location discovery"""
     
+    # Built once at class load; substitute() fills in the per-call values
+    EXTRACTION_PROMPT = string.Template("""Extract office locations and facilities for $company_name from these search results.
+
+$queries_block
+
+REQUIREMENTS:
+1. Only extract locations explicitly mentioned in the search results
+2. Must have at least a city name that appears in the content
+3. Include facility types if mentioned (office, manufacturing, warehouse, etc.)
+4. Include addresses when available
+
+Extract:
+- query: Number of the query whose results mention the location
+- name: Location/facility name
+- address: Street address (if mentioned)  
+- city: City name (required)
+- state: State/province (if mentioned)
+- country: Country (if mentioned)
+- facility_type: Type of facility
+
+Return a JSON object of the form {"locations": [...]}. If no specific locations found, return {"locations": []}
+""")
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_pooled_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except:
             self.llm = None
         logger.info("Multi-Search Engine Agent Node initialized")
@@ -941,15 +1302,13 @@ class MultiSearchEngineAgentNode:
                 f'"{company_name}" international offices global locations worldwide'
             ]
             
-            for query in search_queries[:6]:  # Process first 6 queries
-                try:
-                    locations = self._search_and_extract(query, company_name)
-                    all_locations.extend(locations)
-                    time.sleep(2)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.error(f"Search error for '{query}': {e}")
-                    continue
+            # Search the first 6 queries concurrently; the host limiter paces DuckDuckGo
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                documents = [doc for doc in executor.map(self._search_query, search_queries[:6]) if doc]
+            
+            # One LLM call over every query's snippets instead of one per query
+            if documents:
+                all_locations = self._extract_locations_with_llm(documents, company_name)
             
             # Deduplicate results
             unique_locations = self._deduplicate_search_results(all_locations)
@@ -966,96 +1325,84 @@ class MultiSearchEngineAgentNode:
         
         return state
     
-    def _search_and_extract(self, query: str, company_name: str) -> List[Dict]:
-        """Search and extract locations from results"""
-        locations = []
-        
+    def _search_query(self, query: str) -> Dict:
+        """Run a single search and return its combined snippets, or None if nothing useful came back"""
         try:
             # Use DuckDuckGo (no API key needed)
             search_url = "https://duckduckgo.com/html/"
             params = {'q': query}
             
-            response = self.session.get(search_url, params=params, timeout=15)
+            response = get_with_backoff(self.session, search_url, params=params, timeout=15)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
                 # Extract text from search results
-                result_texts = []
-                for result in soup.find_all('div', class_='result')[:3]:  # Top 3 results
-                    snippet = result.find('div', class_='snippet')
-                    if snippet:
-                        text = snippet.get_text(separator=' ', strip=True)
-                        if len(text) > 50:
-                            result_texts.append(text[:1500])
+                result_texts = [
+                    text[:1500] for text in parse_duckduckgo_snippets(response.text, 3)  # Top 3 results
+                    if len(text) > 50
+                ]
                 
-                # Extract locations using LLM
                 if result_texts:
-                    combined_text = ' '.join(result_texts)
-                    locations = self._extract_locations_with_llm(combined_text, company_name, query)
+                    return {'query': query, 'content': ' '.join(result_texts)}
         
         except Exception as e:
-            logger.error(f"Search and extraction error: {e}")
+            logger.error(f"Search error for '{query}': {e}")
         
-        return locations
+        return None
     
-    def _extract_locations_with_llm(self, content: str, company_name: str, query: str) -> List[Dict]:
-        """Extract locations from search result content"""
+    def _extract_locations_with_llm(self, documents: List[Dict], company_name: str) -> List[Dict]:
+        """Extract locations from the search results of every query in a single call"""
         
-        prompt = f"""Extract office locations and facilities for {company_name} from these search results.
-
-Search Query: {query}
-Content: {content}
-
-REQUIREMENTS:
-1. Only extract locations explicitly mentioned in the search results
-2. Must have at least a city name that appears in the content
-3. Include facility types if mentioned (office, manufacturing, warehouse, etc.)
-4. Include addresses when available
-
-Extract:
-- name: Location/facility name
-- address: Street address (if mentioned)  
-- city: City name (required)
-- state: State/province (if mentioned)
-- country: Country (if mentioned)
-- facility_type: Type of facility
-
-Return JSON array. Return [] if no specific locations found.
-"""
+        queries_block = "\n\n".join(
+            f"[Query {i}]\nSearch Query: {doc['query']}\nContent: {doc['content']}"
+            for i, doc in enumerate(documents, 1)
+        )
+        
+        prompt = self.EXTRACTION_PROMPT.substitute(company_name=company_name, queries_block=queries_block)
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response_content = invoke_llm_cached(self.llm, prompt, json_mode=True)
             
-            json_match = re.search(r'\[.*?\]', response.content, re.DOTALL)
-            if json_match:
-                locs = json.loads(json_match.group())
-                
-                validated_locations = []
-                for loc in locs:
-                    if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
-                        # Basic validation
-                        city = (loc.get('city') or '').lower()
-                        if city in (content or '').lower():  # City must appear in content
-                            loc['source'] = 'multi_search'
-                            loc['confidence'] = 0.75
-                            loc['search_query'] = query
-                            validated_locations.append(loc)
-                
-                return validated_locations
+            validated_locations = []
+            for loc in parse_llm_locations(response_content):
+                if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
+                    document = self._resolve_document(loc.pop('query', None), documents)
+                    
+                    # Basic validation
+                    city = (loc.get('city') or '').lower()
+                    if city in document['content'].lower():  # City must appear in content
+                        loc['source'] = 'multi_search'
+                        loc['confidence'] = 0.75
+                        loc['search_query'] = document['query']
+                        validated_locations.append(loc)
+            
+            return validated_locations
         
         except Exception as e:
             logger.error(f"Multi-search LLM extraction error: {e}")
         
         return []
     
+    def _resolve_document(self, query_number, documents: List[Dict]) -> Dict:
+        """Map the LLM's query number back to its snippets, or all snippets if unknown"""
+        try:
+            index = int(query_number)
+            if 1 <= index <= len(documents):
+                return documents[index - 1]
+        except (TypeError, ValueError):
+            pass
+        
+        return {
+            'query': '',
+            'content': ' '.join(doc['content'] for doc in documents)
+        }
+    
     def _deduplicate_search_results(self, locations: List[Dict]) -> List[Dict]:
         """Remove duplicate search results"""
         seen = set()
         unique = []
         
         for loc in locations:
-            key = ((loc.get('city') or '').lower(), (loc.get('name') or '')[:25].lower())
+            key = (canonicalize(loc.get('city')), canonicalize(loc.get('name'), 25))
             if key not in seen and loc.get('city'):
                 seen.add(key)
                 unique.append(loc)
@@ -1066,12 +1413,59 @@ Return JSON array. Return [] if no specific locations found.
 class IndustrySpecificAgentNode:
     """NEW: Apply industry-specific search strategies"""
     
+    INDUSTRY_KEYWORDS = {
+        'retail': ['retail', 'store', 'shop', 'market', 'mall', 'walmart', 'target'],
+        'manufacturing': ['manufacturing', 'factory', 'industrial', 'steel', 'auto', 'ford', 'gm'],
+        'technology': ['tech', 'software', 'digital', 'microsoft', 'google', 'apple', 'meta'],
+        'financial': ['bank', 'financial', 'capital', 'investment', 'jpmorgan', 'goldman'],
+        'healthcare': ['health', 'medical', 'pharma', 'hospital', 'care', 'pfizer'],
+        'energy': ['energy', 'oil', 'gas', 'petroleum', 'exxon', 'chevron', 'bp'],
+        'logistics': ['logistics', 'shipping', 'transport', 'delivery', 'fedex', 'ups'],
+        'real_estate': ['real estate', 'property', 'realty', 'development']
+    }
+    INDUSTRY_ORDER = list(INDUSTRY_KEYWORDS)
+    KEYWORD_INDUSTRY = {}
+    for _industry, _keywords in INDUSTRY_KEYWORDS.items():
+        for _keyword in _keywords:
+            KEYWORD_INDUSTRY.setdefault(_keyword, _industry)
+    del _industry, _keywords, _keyword
+    # Zero-width lookahead so overlapping keywords are all found in one pass over the name
+    INDUSTRY_KEYWORD_RE = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in KEYWORD_INDUSTRY) + '))')
+    
+    INDUSTRY_STRATEGIES = {
+        'retail': [
+            {'type': 'store_locator', 'terms': ['store locator', 'find a store', 'shop locations']},
+            {'type': 'franchise', 'terms': ['franchise locations', 'franchisee directory']},
+            {'type': 'distribution', 'terms': ['distribution center', 'warehouse locations']}
+        ],
+        'manufacturing': [
+            {'type': 'facilities', 'terms': ['manufacturing facilities', 'production plants', 'factories']},
+            {'type': 'research', 'terms': ['R&D facilities', 'research centers', 'innovation labs']},
+            {'type': 'distribution', 'terms': ['distribution centers', 'logistics hubs']}
+        ],
+        'technology': [
+            {'type': 'offices', 'terms': ['engineering offices', 'development centers', 'tech campuses']},
+            {'type': 'data_centers', 'terms': ['data centers', 'server facilities', 'cloud infrastructure']},
+            {'type': 'research', 'terms': ['research facilities', 'innovation centers']}
+        ],
+        'financial': [
+            {'type': 'branches', 'terms': ['bank branches', 'branch locations', 'banking centers']},
+            {'type': 'offices', 'terms': ['regional offices', 'wealth management centers']},
+            {'type': 'operations', 'terms': ['operations centers', 'processing facilities']}
+        ],
+        'energy': [
+            {'type': 'facilities', 'terms': ['refineries', 'processing plants', 'terminals']},
+            {'type': 'offices', 'terms': ['regional offices', 'exploration offices']},
+            {'type': 'retail', 'terms': ['gas stations', 'service stations', 'fuel locations']}
+        ]
+    }
+    
     def __init__(self):
         try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except:
             self.llm = None
-        self.session = requests.Session()
+        self.session = create_pooled_session()
         logger.info("Industry-Specific Agent Node initialized")
     
     def run(self, state: DiscoveryState) -> DiscoveryState:
@@ -1122,55 +1516,16 @@ class IndustrySpecificAgentNode:
         """Determine industry from company name"""
         company_lower = (company_name or '').lower()
         
-        industry_keywords = {
-            'retail': ['retail', 'store', 'shop', 'market', 'mall', 'walmart', 'target'],
-            'manufacturing': ['manufacturing', 'factory', 'industrial', 'steel', 'auto', 'ford', 'gm'],
-            'technology': ['tech', 'software', 'digital', 'microsoft', 'google', 'apple', 'meta'],
-            'financial': ['bank', 'financial', 'capital', 'investment', 'jpmorgan', 'goldman'],
-            'healthcare': ['health', 'medical', 'pharma', 'hospital', 'care', 'pfizer'],
-            'energy': ['energy', 'oil', 'gas', 'petroleum', 'exxon', 'chevron', 'bp'],
-            'logistics': ['logistics', 'shipping', 'transport', 'delivery', 'fedex', 'ups'],
-            'real_estate': ['real estate', 'property', 'realty', 'development']
-        }
-        
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in company_lower for keyword in keywords):
-                return industry
+        # The lookahead reports a keyword at every position; the earliest-listed industry wins
+        industries = {self.KEYWORD_INDUSTRY[keyword] for keyword in self.INDUSTRY_KEYWORD_RE.findall(company_lower)}
+        if industries:
+            return min(industries, key=self.INDUSTRY_ORDER.index)
         
         return 'general'
     
     def _get_industry_strategies(self, industry: str) -> List[Dict]:
         """Get search strategies specific to the industry"""
-        
-        strategies = {
-            'retail': [
-                {'type': 'store_locator', 'terms': ['store locator', 'find a store', 'shop locations']},
-                {'type': 'franchise', 'terms': ['franchise locations', 'franchisee directory']},
-                {'type': 'distribution', 'terms': ['distribution center', 'warehouse locations']}
-            ],
-            'manufacturing': [
-                {'type': 'facilities', 'terms': ['manufacturing facilities', 'production plants', 'factories']},
-                {'type': 'research', 'terms': ['R&D facilities', 'research centers', 'innovation labs']},
-                {'type': 'distribution', 'terms': ['distribution centers', 'logistics hubs']}
-            ],
-            'technology': [
-                {'type': 'offices', 'terms': ['engineering offices', 'development centers', 'tech campuses']},
-                {'type': 'data_centers', 'terms': ['data centers', 'server facilities', 'cloud infrastructure']},
-                {'type': 'research', 'terms': ['research facilities', 'innovation centers']}
-            ],
-            'financial': [
-                {'type': 'branches', 'terms': ['bank branches', 'branch locations', 'banking centers']},
-                {'type': 'offices', 'terms': ['regional offices', 'wealth management centers']},
-                {'type': 'operations', 'terms': ['operations centers', 'processing facilities']}
-            ],
-            'energy': [
-                {'type': 'facilities', 'terms': ['refineries', 'processing plants', 'terminals']},
-                {'type': 'offices', 'terms': ['regional offices', 'exploration offices']},
-                {'type': 'retail', 'terms': ['gas stations', 'service stations', 'fuel locations']}
-            ]
-        }
-        
-        return strategies.get(industry, strategies['technology'])
+        return self.INDUSTRY_STRATEGIES.get(industry, self.INDUSTRY_STRATEGIES['technology'])
     
     def _execute_strategy(self, strategy: Dict, company_name: str) -> List[Dict]:
         """Execute an industry-specific search strategy"""
@@ -1205,12 +1560,35 @@ class IndustrySpecificAgentNode:
 class EnhancedBusinessDirectoryAgentNode:
     """Enhanced business directory search"""
     
+    # Built once at class load; substitute() fills in the per-call values
+    EXTRACTION_PROMPT = string.Template("""Extract business locations for $company_name from this directory information.
+
+Directory Content:
+$content
+
+REQUIREMENTS:
+1. Only extract locations explicitly mentioned in the directory data
+2. Must have at least a city name from the content
+3. Include business addresses when available
+4. Focus on verified business listings
+
+Extract:
+- name: Business/location name
+- address: Full address (if available)
+- city: City name (required)
+- state: State/province (if available)
+- country: Country (if available)
+- phone: Phone number (if available)
+
+Return a JSON object of the form {"locations": [...]}. If no locations found, return {"locations": []}
+""")
+    
     def __init__(self):
         try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except:
             self.llm = None
-        self.session = requests.Session()
+        self.session = create_pooled_session()
         logger.info("Enhanced Business Directory Agent Node initialized")
     
     def run(self, state: DiscoveryState) -> DiscoveryState:
@@ -1260,75 +1638,54 @@ class EnhancedBusinessDirectoryAgentNode:
             f"{company_name} business directory"
         ]
         
-        for pattern in search_patterns[:3]:  # Limit searches
-            try:
-                # Use DuckDuckGo to search for directory listings
-                search_url = "https://duckduckgo.com/html/"
-                params = {'q': pattern}
-                
-                response = self.session.get(search_url, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Extract relevant snippets
-                    for result in soup.find_all('div', class_='result')[:2]:
-                        snippet = result.find('div', class_='snippet')
-                        if snippet:
-                            text = snippet.get_text(separator=' ', strip=True)
-                            if len(text) > 30:
-                                all_content.append(text[:800])
-                
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Directory search error for '{pattern}': {e}")
-                continue
+        # Limit searches; run them concurrently under the DuckDuckGo host limiter
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for snippets in executor.map(self._search_directory, search_patterns[:3]):
+                all_content.extend(snippets)
         
         return ' '.join(all_content)
     
+    def _search_directory(self, pattern: str) -> List[str]:
+        """Run a single directory search and return its useful snippets"""
+        snippets = []
+        
+        try:
+            # Use DuckDuckGo to search for directory listings
+            search_url = "https://duckduckgo.com/html/"
+            params = {'q': pattern}
+            
+            response = get_with_backoff(self.session, search_url, params=params, timeout=10)
+            
+            if response.status_code == 200:
+                # Extract relevant snippets
+                snippets = [
+                    text[:800] for text in parse_duckduckgo_snippets(response.text, 2)
+                    if len(text) > 30
+                ]
+            
+        except Exception as e:
+            logger.error(f"Directory search error for '{pattern}': {e}")
+        
+        return snippets
+    
     def _extract_directory_locations(self, content: str, company_name: str) -> List[Dict]:
         """Extract locations from directory content"""
         if not content or len(content) < 50:
             return []
         
-        prompt = f"""Extract business locations for {company_name} from this directory information.
-
-Directory Content:
-{content}
-
-REQUIREMENTS:
-1. Only extract locations explicitly mentioned in the directory data
-2. Must have at least a city name from the content
-3. Include business addresses when available
-4. Focus on verified business listings
-
-Extract:
-- name: Business/location name
-- address: Full address (if available)
-- city: City name (required)
-- state: State/province (if available)
-- country: Country (if available)
-- phone: Phone number (if available)
-
-Return JSON array. Return [] if no locations found.
-"""
+        prompt = self.EXTRACTION_PROMPT.substitute(company_name=company_name, content=content)
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response_content = invoke_llm_cached(self.llm, prompt, json_mode=True)
             
-            json_match = re.search(r'\[.*?\]', response.content, re.DOTALL)
-            if json_match:
-                locs = json.loads(json_match.group())
-                
-                validated_locations = []
-                for loc in locs:
-                    if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
-                        loc['source'] = 'business_directory'
-                        loc['confidence'] = 0.8
-                        validated_locations.append(loc)
-                
-                return validated_locations
+            validated_locations = []
+            for loc in parse_llm_locations(response_content):
+                if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
+                    loc['source'] = 'business_directory'
+                    loc['confidence'] = 0.8
+                    validated_locations.append(loc)
+            
+            return validated_locations
         
         except Exception as e:
             logger.error(f"Directory LLM extraction error: {e}")
@@ -1338,6 +1695,45 @@ Return JSON array. Return [] if no locations found.
 
 # ===== PROCESSING NODES =====
 
+class ParallelDiscoveryNode:
+    """Run independent agent nodes concurrently and merge their results"""
+    
+    def __init__(self, agent_nodes: Dict):
+        # Maps each agent's result key to the node that produces it
+        self.agent_nodes = agent_nodes
+        logger.info(f"Parallel Discovery Node initialized with {len(agent_nodes)} agents")
+    
+    def run(self, state: DiscoveryState) -> DiscoveryState:
+        """Fan out all pending agents and wait for the slowest one"""
+        pending = {
+            key: node for key, node in self.agent_nodes.items()
+            if state.get(key) is None
+        }
+        if not pending:
+            return state
+        
+        logger.info(f"Parallel discovery: Running {', '.join(pending)} concurrently")
+        
+        # Agents are I/O bound and write disjoint result keys, so threads are sufficient.
+        # Each gets its own message list so the log reads in agent order, not completion order.
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = {
+                key: executor.submit(node.run, {**state, 'messages': []})
+                for key, node in pending.items()
+            }
+            
+            for key, future in futures.items():
+                try:
+                    result = future.result()
+                    state[key] = result.get(key) or []
+                    state['messages'].extend(result.get('messages', []))
+                except Exception as e:
+                    logger.error(f"Parallel discovery error for {key}: {e}")
+                    state[key] = []
+        
+        return state
+
+
 class AggregatorNode:
     """Aggregate results from all agents"""
     
@@ -1350,22 +1746,28 @@ class AggregatorNode:
             return state
         
         all_locations = []
+        sources_used = {}
         
         # Collect from all agent sources including new ones
-        sources = [
-            'google_maps_results', 'tavily_search_results', 
-            'web_scraper_results', 'directory_results',
-            'sec_filing_results', 'multi_search_results', 
-            'industry_specific_results'
-        ]
+        sources = {
+            'google_maps': 'google_maps_results',
+            'tavily': 'tavily_search_results',
+            'website': 'web_scraper_results',
+            'directory': 'directory_results',
+            'sec_filings': 'sec_filing_results',
+            'multi_search': 'multi_search_results',
+            'industry_specific': 'industry_specific_results'
+        }
         
-        for source in sources:
-            locations = state.get(source, [])
+        for source_name, source in sources.items():
+            locations = state.get(source) or []
+            sources_used[source_name] = len(locations)
             if locations:
                 logger.info(f"Aggregating {len(locations)} locations from {source}")
                 all_locations.extend(locations)
         
         state['all_locations'] = all_locations
+        state['sources_used'] = sources_used
         state['messages'].append(
             AIMessage(content=f"Aggregated {len(all_locations)} total locations from all sources")
         )
@@ -1377,6 +1779,17 @@ class AggregatorNode:
 class EnhancedDeduplicationNode:
     """Enhanced deduplication with less aggressive filtering"""
     
+    FAKE_INDICATORS = [
+        'location search attempted', 'no results', 'various sources checked',
+        'search performed', 'unknown location', 'test location',
+        'example location', 'sample location', 'dummy location'
+    ]
+    # One alternation scans each row once, however many indicators are added
+    FAKE_INDICATOR_RE = re.compile('|'.join(re.escape(indicator) for indicator in FAKE_INDICATORS))
+    
+    # Free-text fields normalized to stripped strings, in output order
+    TEXT_FIELDS = ('name', 'address', 'city', 'state', 'country', 'postal_code', 'phone', 'website', 'facility_type')
+    
     def __init__(self):
         logger.info("Enhanced Deduplication Node initialized")
     
@@ -1408,13 +1821,6 @@ class EnhancedDeduplicationNode:
     def _filter_fake_locations(self, locations: List[Dict]) -> List[Dict]:
         """Filter out obviously fake or invalid locations"""
         filtered = []
-        filtered_out = 0
-        
-        fake_indicators = [
-            'location search attempted', 'no results', 'various sources checked',
-            'search performed', 'unknown location', 'test location',
-            'example location', 'sample location', 'dummy location'
-        ]
         
         for loc in locations:
             city = (loc.get('city') or '').lower().strip()
@@ -1427,7 +1833,7 @@ class EnhancedDeduplicationNode:
             
             # Skip obvious fake patterns
             full_text = f"{city} {name} {address}"
-            if any(indicator in full_text for indicator in fake_indicators):
+            if self.FAKE_INDICATOR_RE.search(full_text):
                 logger.info(f"Filtered fake location: {loc.get('name', 'Unknown')}")
                 continue
             
@@ -1439,25 +1845,23 @@ class EnhancedDeduplicationNode:
     def _deduplicate_locations(self, locations: List[Dict]) -> List[Dict]:
         """Deduplicate locations using fuzzy matching"""
         unique = []
-        processed = set()
+        # Duplicates always share a city, so only keys within the same city are compared
+        buckets = {}
         
         for loc in locations:
-            city = (loc.get('city') or '').lower().strip()
-            name = (loc.get('name') or '').lower().strip()
+            city = ' '.join((loc.get('city') or '').lower().split())
+            name = ' '.join((loc.get('name') or '').lower().split())
             
             # Create a key for comparison
             key = f"{city}_{name[:20]}"
+            bucket = buckets.setdefault(city, [])
             
             # Check for similar keys (fuzzy matching)
-            is_duplicate = False
-            for existing_key in processed:
-                if self._are_similar_locations(key, existing_key):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                processed.add(key)
-                unique.append(loc)
+            if key in bucket or any(self._are_similar_locations(key, existing_key) for existing_key in bucket):
+                continue
+            
+            bucket.append(key)
+            unique.append(loc)
         
         return unique
     
@@ -1486,16 +1890,8 @@ class EnhancedDeduplicationNode:
         enhanced = []
         
         for loc in locations:
-            enhanced_loc = {
-                'name': (loc.get('name') or '').strip(),
-                'address': (loc.get('address') or '').strip(),
-                'city': (loc.get('city') or '').strip(),
-                'state': (loc.get('state') or '').strip(),
-                'country': (loc.get('country') or '').strip(),
-                'postal_code': (loc.get('postal_code') or '').strip(),
-                'phone': (loc.get('phone') or '').strip(),
-                'website': (loc.get('website') or '').strip(),
-                'facility_type': (loc.get('facility_type') or '').strip(),
+            enhanced_loc = {field: str(loc.get(field) or '').strip() for field in self.TEXT_FIELDS}
+            enhanced_loc.update({
                 'lat': loc.get('lat', ''),
                 'lng': loc.get('lng', ''),
                 'confidence': loc.get('confidence', 0.5),
@@ -1503,7 +1899,7 @@ class EnhancedDeduplicationNode:
                 'source_url': loc.get('source_url', ''),
                 'search_query': loc.get('search_query', ''),
                 'search_pattern': loc.get('search_pattern', '')
-            }
+            })
             enhanced.append(enhanced_loc)
         
         return enhanced
@@ -1512,6 +1908,43 @@ class EnhancedDeduplicationNode:
 class LocationEnrichmentNode:
     """Enrich locations with complete details"""
     
+    KNOWN_HEADQUARTERS = {
+        "microsoft": {
+            'name': "Microsoft Corporation Headquarters", 
+            'address': "1 Microsoft Way",
+            'city': "Redmond",
+            'state': "WA", 
+            'country': "USA",
+            'postal_code': "98052",
+            'confidence': 0.95,
+            'source': 'known_headquarters'
+        },
+        "apple": {
+            'name': "Apple Inc. Headquarters",
+            'address': "1 Apple Park Way", 
+            'city': "Cupertino",
+            'state': "CA",
+            'country': "USA", 
+            'postal_code': "95014",
+            'confidence': 0.95,
+            'source': 'known_headquarters'
+        },
+        "google": {
+            'name': "Google LLC Headquarters",
+            'address': "1600 Amphitheatre Parkway",
+            'city': "Mountain View", 
+            'state': "CA",
+            'country': "USA",
+            'postal_code': "94043", 
+            'confidence': 0.95,
+            'source': 'known_headquarters'
+        }
+        # Add more as needed
+    }
+    # Single scan of the casefolded company name however many known companies are listed
+    KNOWN_HQ_RE = re.compile('|'.join(re.escape(name.casefold()) for name in KNOWN_HEADQUARTERS))
+    KNOWN_HQ_KEYS = {name.casefold(): name for name in KNOWN_HEADQUARTERS}
+    
     def __init__(self):
         logger.info("Location Enrichment Node initialized")
     
@@ -1538,20 +1971,18 @@ class LocationEnrichmentNode:
                     AIMessage(content=f"No locations found by any agents for {company_name}")
                 )
         
-        # Enrich all locations
+        # Enrich all locations in place - deduplication built these dicts fresh and nothing else holds them
         enriched = []
         for i, loc in enumerate(locations, 1):
-            enriched_loc = dict(loc)  # Copy existing data
-            
             # Add location ID
-            enriched_loc['location_id'] = f"LOC_{i:03d}"
+            loc['location_id'] = f"LOC_{i:03d}"
             
             # Ensure name is set
-            if not enriched_loc.get('name'):
-                city = enriched_loc.get('city', 'Unknown')
-                enriched_loc['name'] = f"{company_name} - {city}"
+            if not loc.get('name'):
+                city = loc.get('city', 'Unknown')
+                loc['name'] = f"{company_name} - {city}"
             
-            enriched.append(enriched_loc)
+            enriched.append(loc)
         
         state['enriched_locations'] = enriched
         state['final_locations'] = enriched
@@ -1564,46 +1995,11 @@ class LocationEnrichmentNode:
     
     def _get_known_headquarters(self, company_name: str) -> Dict:
         """Get known corporate headquarters for major companies"""
-        company_lower = (company_name or '').lower()
-        
-        known_companies = {
-            "microsoft": {
-                'name': "Microsoft Corporation Headquarters", 
-                'address': "1 Microsoft Way",
-                'city': "Redmond",
-                'state': "WA", 
-                'country': "USA",
-                'postal_code': "98052",
-                'confidence': 0.95,
-                'source': 'known_headquarters'
-            },
-            "apple": {
-                'name': "Apple Inc. Headquarters",
-                'address': "1 Apple Park Way", 
-                'city': "Cupertino",
-                'state': "CA",
-                'country': "USA", 
-                'postal_code': "95014",
-                'confidence': 0.95,
-                'source': 'known_headquarters'
-            },
-            "google": {
-                'name': "Google LLC Headquarters",
-                'address': "1600 Amphitheatre Parkway",
-                'city': "Mountain View", 
-                'state': "CA",
-                'country': "USA",
-                'postal_code': "94043", 
-                'confidence': 0.95,
-                'source': 'known_headquarters'
-            }
-            # Add more as needed
-        }
-        
-        for known_name, hq_info in known_companies.items():
-            if known_name in company_lower:
-                logger.info(f"Found known headquarters for {company_name}")
-                return hq_info
+        # casefold handles non-ASCII names that lower() leaves unmatched (e.g. German sharp s)
+        match = self.KNOWN_HQ_RE.search((company_name or '').casefold())
+        if match:
+            logger.info(f"Found known headquarters for {company_name}")
+            return dict(self.KNOWN_HEADQUARTERS[self.KNOWN_HQ_KEYS[match.group(0)]])
         
         return None
 
@@ -1611,6 +2007,48 @@ class LocationEnrichmentNode:
 class EnhancedExportNode:
     """Enhanced export with comprehensive reporting"""
     
+    SOURCE_NAMES = {
+        'google_maps': 'Google Maps',
+        'tavily': 'Tavily Search', 
+        'company_website': 'Company Website',
+        'business_directory': 'Business Directory',
+        'sec_filing': 'SEC Filings',
+        'multi_search': 'Multi-Search Engine',
+        'industry_specific': 'Industry-Specific Search',
+        'known_headquarters': 'Known HQ Data',
+        'unknown': 'Unknown'
+    }
+    ENHANCEMENT_FEATURES = (
+        'Multiple search patterns per agent',
+        'Enhanced web scraping with sitemap discovery',
+        'Industry-specific search strategies',
+        'SEC filings integration (placeholder)',
+        'Multi-search engine coverage',
+        'Advanced deduplication with fuzzy matching',
+        'Comprehensive source tracking'
+    )
+    # Export column -> (location field, default) for every per-location column
+    LOCATION_FIELDS = {
+        'Location_Name': ('name', ''),
+        'Street_Address': ('address', ''),
+        'City': ('city', ''),
+        'State_Province': ('state', ''),
+        'Country': ('country', ''),
+        'Postal_Code': ('postal_code', ''),
+        'Phone': ('phone', ''),
+        'Website': ('website', ''),
+        'Facility_Type': ('facility_type', ''),
+        'Latitude': ('lat', ''),
+        'Longitude': ('lng', ''),
+        'Data_Source': ('source', 'unknown'),
+        'Source_Confidence': ('confidence', ''),
+        'Source_URL': ('source_url', ''),
+        'Search_Query': ('search_query', ''),
+        'Search_Pattern': ('search_pattern', '')
+    }
+    PANDAS_CSV_MIN_ROWS = 10_000
+    MAX_EXCEL_ROWS = 50_000
+    
     def __init__(self, output_dir: str = "/tmp/output"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -1621,34 +2059,50 @@ class EnhancedExportNode:
         if state.get('export_files'):
             return state
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock read shared by the file names and every timestamp written into the exports
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         company_slug = (state['company_name'] or '').lower().replace(' ', '_').replace('-', '_')[:30]
         
         locations = state.get('final_locations', [])
         
-        # Create comprehensive DataFrame
-        df = self._create_enhanced_dataframe(locations, state)
+        # Nothing to tabulate - skip DataFrame/CSV/JSON/Excel construction entirely
+        if not locations:
+            summary_file = self._create_empty_summary(state, company_slug, timestamp, now)
+            state['export_files'] = [str(summary_file)]
+            state['messages'].append(
+                AIMessage(content="Enhanced export skipped - no locations to export")
+            )
+            logger.info(f"Enhanced export skipped: no locations found for {state['company_name']}")
+            return state
+        
+        # Materialize the export columns once; CSV, summary and Excel all read from them
+        columns = self._build_export_columns(locations, state, now)
+        df = self._create_enhanced_dataframe(columns)
         
         export_files = []
         
         # 1. Clean CSV for general use
-        csv_file = self._create_clean_csv(df, company_slug, timestamp)
+        csv_file = self._create_clean_csv(columns, df, company_slug, timestamp)
         export_files.append(str(csv_file))
         
         # 2. Detailed JSON for developers
-        json_file = self._create_detailed_json(locations, state, company_slug, timestamp)
+        json_file = self._create_detailed_json(locations, state, company_slug, timestamp, now)
         export_files.append(str(json_file))
         
         # 3. Summary report
-        summary_file = self._create_summary_report(df, state, company_slug, timestamp)
+        summary_file = self._create_summary_report(df, state, company_slug, timestamp, now)
         export_files.append(str(summary_file))
         
-        # 4. Try Excel (optional)
-        try:
-            excel_file = self._create_enhanced_excel(df, state, company_slug, timestamp)
-            export_files.append(str(excel_file))
-        except Exception as e:
-            logger.warning(f"Excel export failed: {e}")
+        # 4. Try Excel (optional) - very large workbooks take minutes, the CSV covers those
+        if len(locations) <= self.MAX_EXCEL_ROWS:
+            try:
+                excel_file = self._create_enhanced_excel(df, state, company_slug, timestamp)
+                export_files.append(str(excel_file))
+            except Exception as e:
+                logger.warning(f"Excel export failed: {e}")
+        else:
+            logger.info(f"Skipping Excel export ({len(locations)} rows exceeds {self.MAX_EXCEL_ROWS})")
         
         state['export_files'] = export_files
         state['messages'].append(
@@ -1658,94 +2112,107 @@ class EnhancedExportNode:
         logger.info(f"Enhanced export completed: {len(locations)} locations in {len(export_files)} formats")
         return state
     
-    def _create_enhanced_dataframe(self, locations, state):
-        """Create comprehensive DataFrame with all location data"""
-        
-        enhanced_data = []
+    def _build_export_columns(self, locations, state, now) -> Dict[str, list]:
+        """Build one list per export column rather than a dict per row"""
+        count = len(locations)
+        fields = self.LOCATION_FIELDS
+        # Enriched locations carry every field, so one C-level itemgetter call reads a whole row
+        get_row = operator.itemgetter('location_id', *(field for field, _ in fields.values()))
         
-        for i, loc in enumerate(locations, 1):
-            row = {
-                'Location_ID': loc.get('location_id', f"LOC_{i:03d}"),
-                'Company_Name': state['company_name'],
-                'Location_Name': loc.get('name', ''),
-                'Street_Address': loc.get('address', ''),
-                'City': loc.get('city', ''),
-                'State_Province': loc.get('state', ''),
-                'Country': loc.get('country', ''),
-                'Postal_Code': loc.get('postal_code', ''),
-                'Phone': loc.get('phone', ''),
-                'Website': loc.get('website', ''),
-                'Facility_Type': loc.get('facility_type', ''),
-                
-                # Geographic data
-                'Latitude': loc.get('lat', ''),
-                'Longitude': loc.get('lng', ''),
-                
-                # Source and quality data
-                'Data_Source': self._format_source_name(loc.get('source', 'unknown')),
-                'Source_Confidence': loc.get('confidence', ''),
-                'Source_URL': loc.get('source_url', ''),
-                'Search_Query': loc.get('search_query', ''),
-                'Search_Pattern': loc.get('search_pattern', ''),
-                
-                # Metadata
-                'Discovery_Date': datetime.now().strftime('%Y-%m-%d'),
-                'Discovery_Time': datetime.now().strftime('%H:%M:%S'),
-                'Company_Website': state.get('company_url', ''),
-            }
-            
-            enhanced_data.append(row)
+        def row(i, loc):
+            try:
+                return get_row(loc)
+            except KeyError:
+                # e.g. the known-HQ fallback, which only has address fields
+                return (loc.get('location_id', f"LOC_{i:03d}"),) + tuple(loc.get(field, default) for field, default in fields.values())
+        
+        # Single pass over the locations; zip(*) transposes the row tuples into columns
+        rows = [row(i, loc) for i, loc in enumerate(locations, 1)]
+        location_ids, *values = map(list, zip(*rows)) if rows else [[] for _ in range(len(fields) + 1)]
+        column = dict(zip(fields, values))
+        
+        def constant(value):
+            return [value] * count
+        
+        return {
+            'Location_ID': location_ids,
+            'Company_Name': constant(state['company_name']),
+            'Location_Name': column['Location_Name'],
+            'Street_Address': column['Street_Address'],
+            'City': column['City'],
+            'State_Province': column['State_Province'],
+            'Country': column['Country'],
+            'Postal_Code': column['Postal_Code'],
+            'Phone': column['Phone'],
+            'Website': column['Website'],
+            'Facility_Type': column['Facility_Type'],
+            
+            # Geographic data
+            'Latitude': column['Latitude'],
+            'Longitude': column['Longitude'],
+            
+            # Source and quality data
+            'Data_Source': self._format_source_names(column['Data_Source']),
+            'Source_Confidence': [self._to_confidence(value) for value in column['Source_Confidence']],
+            'Source_URL': column['Source_URL'],
+            'Search_Query': column['Search_Query'],
+            'Search_Pattern': column['Search_Pattern'],
+            
+            # Metadata - every row shares the same timestamp
+            'Discovery_Date': constant(now.strftime('%Y-%m-%d')),
+            'Discovery_Time': constant(now.strftime('%H:%M:%S')),
+            'Company_Website': constant(state.get('company_url', '')),
+        }
+    
+    def _to_confidence(self, value) -> float:
+        """Coerce a confidence to float so the column stays numeric; unparseable values count as 0"""
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return 0.0
+        return number if number == number else 0.0  # NaN
+    
+    def _create_enhanced_dataframe(self, columns: Dict[str, list]):
+        """Create comprehensive DataFrame with all location data"""
+        import pandas as pd  # Deferred - only the export stage needs pandas
         
-        return pd.DataFrame(enhanced_data)
+        return pd.DataFrame(columns)
     
     def _format_source_name(self, source):
         """Format source names for readability"""
-        source_map = {
-            'google_maps': 'Google Maps',
-            'tavily': 'Tavily Search', 
-            'company_website': 'Company Website',
-            'business_directory': 'Business Directory',
-            'sec_filing': 'SEC Filings',
-            'multi_search': 'Multi-Search Engine',
-            'industry_specific': 'Industry-Specific Search',
-            'known_headquarters': 'Known HQ Data',
-            'unknown': 'Unknown'
-        }
-        return source_map.get((source or '').lower(), (source or '').title())
+        return self.SOURCE_NAMES.get((source or '').lower(), (source or '').title())
+    
+    def _format_source_names(self, sources: List[str]) -> List[str]:
+        """Format a column of source names, formatting each distinct source only once"""
+        formatted = {source: self._format_source_name(source) for source in set(sources)}
+        return [formatted[source] for source in sources]
     
-    def _create_clean_csv(self, df, company_slug, timestamp):
+    def _create_clean_csv(self, columns, df, company_slug, timestamp):
         """Create clean CSV file"""
         csv_file = self.output_dir / f"{company_slug}_{timestamp}_locations_enhanced.csv"
+        
+        # Typical result sets are small enough that the stdlib writer beats pandas' setup cost
+        if len(df) < self.PANDAS_CSV_MIN_ROWS:
+            with open(csv_file, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns.keys())
+                writer.writerows(zip(*columns.values()))
+            return csv_file
+        
         df.to_csv(csv_file, index=False, encoding='utf-8-sig')
         return csv_file
     
-    def _create_detailed_json(self, locations, state, company_slug, timestamp):
+    def _create_detailed_json(self, locations, state, company_slug, timestamp, now):
         """Create detailed JSON for developers"""
         json_file = self.output_dir / f"{company_slug}_{timestamp}_detailed_enhanced.json"
         
         detailed_data = {
             'company': state['company_name'],
             'company_url': state.get('company_url', ''),
-            'discovery_timestamp': datetime.now().isoformat(),
+            'discovery_timestamp': now.isoformat(),
             'total_locations': len(locations),
-            'sources_used': {
-                'google_maps': len(state.get('google_maps_results', [])),
-                'tavily': len(state.get('tavily_search_results', [])),
-                'website': len(state.get('web_scraper_results', [])),
-                'directory': len(state.get('directory_results', [])),
-                'sec_filings': len(state.get('sec_filing_results', [])),
-                'multi_search': len(state.get('multi_search_results', [])),
-                'industry_specific': len(state.get('industry_specific_results', []))
-            },
-            'enhancement_features': [
-                'Multiple search patterns per agent',
-                'Enhanced web scraping with sitemap discovery',
-                'Industry-specific search strategies',
-                'SEC filings integration (placeholder)',
-                'Multi-search engine coverage',
-                'Advanced deduplication with fuzzy matching',
-                'Comprehensive source tracking'
-            ],
+            'sources_used': state.get('sources_used', {}),
+            'enhancement_features': self.ENHANCEMENT_FEATURES,
             'locations': locations,
             'debug_info': {
                 'messages': [msg.content if hasattr(msg, 'content') else str(msg) 
@@ -1754,79 +2221,99 @@ class EnhancedExportNode:
             }
         }
         
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(detailed_data, f, indent=2, default=str, ensure_ascii=False)
+        if orjson:
+            # orjson writes UTF-8 bytes directly and keeps its native encoder with indentation on
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(detailed_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(detailed_data, f, indent=2, default=str, ensure_ascii=False)
         
         return json_file
     
     def _create_enhanced_excel(self, df, state, company_slug, timestamp):
         """Create enhanced Excel with multiple sheets"""
+        import pandas as pd
+        
         excel_file = self.output_dir / f"{company_slug}_{timestamp}_ENHANCED_REPORT.xlsx"
         
-        with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+        # xlsxwriter streams cells out instead of building an openpyxl object per cell
+        with pd.ExcelWriter(excel_file, engine=EXCEL_ENGINE) as writer:
             # Main locations sheet
             df.to_excel(writer, sheet_name='Locations', index=False)
             
-            # Summary by source
             if not df.empty:
-                source_summary = df['Data_Source'].value_counts().reset_index()
-                source_summary.columns = ['Data_Source', 'Location_Count']
-                source_summary.to_excel(writer, sheet_name='Summary by Source', index=False)
+                # One hash pass over both columns; each sheet rolls up the joint counts
+                counts = df.groupby(['Data_Source', 'Country'], sort=False, dropna=False).size()
+                
+                # Summary by source
+                source_summary = counts.groupby(level='Data_Source').sum().sort_values(ascending=False)
+                source_summary.reset_index(name='Location_Count').to_excel(writer, sheet_name='Summary by Source', index=False)
                 
                 # Geographic summary
-                if 'Country' in df.columns:
-                    geo_summary = df['Country'].value_counts().reset_index()
-                    geo_summary.columns = ['Country', 'Location_Count']
-                    geo_summary.to_excel(writer, sheet_name='Geographic Summary', index=False)
+                geo_summary = counts.groupby(level='Country').sum().sort_values(ascending=False)
+                geo_summary.reset_index(name='Location_Count').to_excel(writer, sheet_name='Geographic Summary', index=False)
         
         return excel_file
     
-    def _create_summary_report(self, df, state, company_slug, timestamp):
+    def _create_summary_report(self, df, state, company_slug, timestamp, now):
         """Create human-readable summary report"""
         
         summary_file = self.output_dir / f"{company_slug}_{timestamp}_ENHANCED_SUMMARY.txt"
         
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write("="*60 + "\n")
-            f.write("ENHANCED LOCATION DISCOVERY REPORT\n") 
-            f.write("="*60 + "\n\n")
-            
-            f.write(f"Company: {state['company_name']}\n")
-            f.write(f"Company Website: {state.get('company_url', 'Not provided')}\n")
-            f.write(f"Discovery Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            f.write("="*40 + "\n")
-            f.write("ENHANCEMENT FEATURES\n")
-            f.write("="*40 + "\n")
-            f.write("✓ Multiple search patterns per Google Maps query\n")
-            f.write("✓ 5+ targeted Tavily search queries per company\n")
-            f.write("✓ Enhanced web scraping with sitemap discovery\n")
-            f.write("✓ Up to 25 pages scraped per domain (vs 5 previously)\n")
-            f.write("✓ SEC filings integration (placeholder implementation)\n")
-            f.write("✓ Multi-search engine coverage\n")
-            f.write("✓ Industry-specific search strategies\n")
-            f.write("✓ Advanced deduplication with fuzzy matching\n")
-            f.write("✓ Comprehensive source tracking\n\n")
-            
-            f.write("="*40 + "\n")
-            f.write("RESULTS SUMMARY\n")
-            f.write("="*40 + "\n")
-            f.write(f"Total Locations Found: {len(df)}\n")
+        # Build the whole report in memory and write it in one call
+        parts = [
+            "="*60 + "\n",
+            "ENHANCED LOCATION DISCOVERY REPORT\n",
+            "="*60 + "\n\n",
+            
+            f"Company: {state['company_name']}\n",
+            f"Company Website: {state.get('company_url', 'Not provided')}\n",
+            f"Discovery Date: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+            
+            "="*40 + "\n",
+            "ENHANCEMENT FEATURES\n",
+            "="*40 + "\n",
+            "✓ Multiple search patterns per Google Maps query\n",
+            "✓ 5+ targeted Tavily search queries per company\n",
+            "✓ Enhanced web scraping with sitemap discovery\n",
+            "✓ Up to 25 pages scraped per domain (vs 5 previously)\n",
+            "✓ SEC filings integration (placeholder implementation)\n",
+            "✓ Multi-search engine coverage\n",
+            "✓ Industry-specific search strategies\n",
+            "✓ Advanced deduplication with fuzzy matching\n",
+            "✓ Comprehensive source tracking\n\n",
+            
+            "="*40 + "\n",
+            "RESULTS SUMMARY\n",
+            "="*40 + "\n",
+            f"Total Locations Found: {len(df)}\n"
+        ]
+        
+        if not df.empty:
+            parts.append(f"Countries Covered: {df['Country'].nunique()}\n")
+            parts.append(f"Cities Covered: {df['City'].nunique()}\n\n")
             
-            if not df.empty:
-                f.write(f"Countries Covered: {df['Country'].nunique()}\n")
-                f.write(f"Cities Covered: {df['City'].nunique()}\n\n")
-                
-                f.write("Locations by Enhanced Source:\n")
-                source_counts = df['Data_Source'].value_counts()
-                for source, count in source_counts.items():
-                    f.write(f"  • {source}: {count} locations\n")
-                
-                f.write(f"\nTop Countries:\n")
-                country_counts = df['Country'].value_counts().head(5)
-                for country, count in country_counts.items():
-                    if country:
-                        f.write(f"  • {country}: {count} locations\n")
+            parts.append("Locations by Enhanced Source:\n")
+            source_counts = df['Data_Source'].value_counts()
+            parts.extend(f"  • {source}: {count} locations\n" for source, count in source_counts.items())
+            
+            parts.append("\nTop Countries:\n")
+            country_counts = df['Country'].value_counts().head(5)
+            parts.extend(f"  • {country}: {count} locations\n" for country, count in country_counts.items() if country)
+        
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
+        
+        return summary_file
+    
+    def _create_empty_summary(self, state, company_slug, timestamp, now):
+        """Create minimal summary report when no locations were found"""
+        summary_file = self.output_dir / f"{company_slug}_{timestamp}_ENHANCED_SUMMARY.txt"
+        
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            f.write(f"No locations found for {state['company_name']} "
+                    f"({now.strftime('%Y-%m-%d %H:%M:%S')})\n")
         
         return summary_file
 
@@ -1836,7 +2323,7 @@ class SummaryNode:
     
     def __init__(self):
         try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
+            self.llm = get_llm(os.getenv("OPENAI_API_KEY"))
         except:
             self.llm = None
         logger.info("Summary Node initialized")
@@ -1851,17 +2338,9 @@ class SummaryNode:
             'url': state['company_url'],
             'timestamp': datetime.now().isoformat(),
             'total_locations': len(state.get('final_locations', [])),
-            'sources_used': {
-                'google_maps': len(state.get('google_maps_results', [])),
-                'tavily': len(state.get('tavily_search_results', [])),
-                'website': len(state.get('web_scraper_results', [])),
-                'directory': len(state.get('directory_results', [])),
-                'sec_filings': len(state.get('sec_filing_results', [])),
-                'multi_search': len(state.get('multi_search_results', [])),
-                'industry_specific': len(state.get('industry_specific_results', []))
-            },
+            'sources_used': state.get('sources_used', {}),
             'enhancement_multiplier': self._calculate_enhancement_multiplier(state),
-            'url_processed': bool(clean_and_validate_url(state.get('company_url', '')))
+            'url_processed': bool(state.get('company_url'))  # discover() stores the already-cleaned URL
         }
         
         state['summary'] = summary
@@ -1903,55 +2382,33 @@ Provide a 2-sentence summary highlighting the key results and enhancements used.
 class EnhancedSupervisorNode:
     """Enhanced orchestrator for all agents"""
     
+    # (state key that marks a stage done, node that produces it), in workflow order
+    ROUTES = [
+        ('google_maps_results', 'parallel_discovery'),
+        ('tavily_search_results', 'parallel_discovery'),
+        ('web_scraper_results', 'parallel_discovery'),
+        ('sec_filing_results', 'parallel_discovery'),
+        ('multi_search_results', 'parallel_discovery'),
+        ('industry_specific_results', 'parallel_discovery'),
+        ('directory_results', 'parallel_discovery'),
+        ('all_locations', 'aggregator'),
+        ('deduplicated_locations', 'deduplication'),
+        ('enriched_locations', 'enricher'),
+        ('export_files', 'exporter'),
+        ('summary', 'summary')
+    ]
+    
     def __init__(self):
         logger.info("Enhanced Supervisor Node initialized")
     
     def run(self, state: DiscoveryState) -> DiscoveryState:
         """Route to next agent including new enhanced agents"""
         
-        # Check completion status for all agents
-        agents_status = {
-            'google_maps': state.get('google_maps_results') is not None,
-            'tavily_search': state.get('tavily_search_results') is not None,
-            'web_scraper': state.get('web_scraper_results') is not None,
-            'directory': state.get('directory_results') is not None,
-            'sec_filing': state.get('sec_filing_results') is not None,
-            'multi_search': state.get('multi_search_results') is not None,
-            'industry_specific': state.get('industry_specific_results') is not None,
-            'aggregated': state.get('all_locations') is not None,
-            'deduplicated': state.get('deduplicated_locations') is not None,
-            'enriched': state.get('enriched_locations') is not None,
-            'exported': state.get('export_files') is not None,
-            'summary': state.get('summary') is not None
-        }
-        
-        # Determine next step in enhanced workflow
-        if not agents_status['google_maps']:
-            state['next_agent'] = 'google_maps'
-        elif not agents_status['tavily_search']:
-            state['next_agent'] = 'tavily_search'
-        elif not agents_status['web_scraper']:
-            state['next_agent'] = 'web_scraper'
-        elif not agents_status['sec_filing']:
-            state['next_agent'] = 'sec_filing'
-        elif not agents_status['multi_search']:
-            state['next_agent'] = 'multi_search'
-        elif not agents_status['industry_specific']:
-            state['next_agent'] = 'industry_specific'
-        elif not agents_status['directory']:
-            state['next_agent'] = 'directory'
-        elif not agents_status['aggregated']:
-            state['next_agent'] = 'aggregator'
-        elif not agents_status['deduplicated']:
-            state['next_agent'] = 'deduplication'
-        elif not agents_status['enriched']:
-            state['next_agent'] = 'enricher'
-        elif not agents_status['exported']:
-            state['next_agent'] = 'exporter'
-        elif not agents_status['summary']:
-            state['next_agent'] = 'summary'
-        else:
-            state['next_agent'] = 'end'
+        # First stage whose output is still missing runs next
+        state['next_agent'] = next(
+            (agent for status_key, agent in self.ROUTES if state.get(status_key) is None),
+            'end'
+        )
         
         logger.info(f"Enhanced Supervisor: Next agent is {state['next_agent']}")
         return state
@@ -1990,6 +2447,17 @@ class SuperEnhancedDiscoveryWorkflow:
         self.multi_search_node = MultiSearchEngineAgentNode()
         self.industry_node = IndustrySpecificAgentNode()
         
+        # All agents run concurrently - they only read the company inputs
+        self.parallel_discovery_node = ParallelDiscoveryNode({
+            'google_maps_results': self.google_maps_node,
+            'tavily_search_results': self.tavily_node,
+            'web_scraper_results': self.web_scraper_node,
+            'sec_filing_results': self.sec_node,
+            'multi_search_results': self.multi_search_node,
+            'industry_specific_results': self.industry_node,
+            'directory_results': self.directory_node
+        })
+        
         # Processing nodes
         self.aggregator_node = AggregatorNode()
         self.deduplication_node = EnhancedDeduplicationNode()
@@ -2011,13 +2479,7 @@ class SuperEnhancedDiscoveryWorkflow:
         
         # Add all enhanced nodes
         workflow.add_node("supervisor", self.supervisor_node.run)
-        workflow.add_node("google_maps", self.google_maps_node.run)
-        workflow.add_node("tavily_search", self.tavily_node.run)
-        workflow.add_node("web_scraper", self.web_scraper_node.run)
-        workflow.add_node("sec_filing", self.sec_node.run)
-        workflow.add_node("multi_search", self.multi_search_node.run)
-        workflow.add_node("industry_specific", self.industry_node.run)
-        workflow.add_node("directory", self.directory_node.run)
+        workflow.add_node("parallel_discovery", self.parallel_discovery_node.run)
         workflow.add_node("aggregator", self.aggregator_node.run)
         workflow.add_node("deduplication", self.deduplication_node.run)
         workflow.add_node("enricher", self.enrichment_node.run)
@@ -2036,13 +2498,7 @@ class SuperEnhancedDiscoveryWorkflow:
             "supervisor",
             route_next,
             {
-                "google_maps": "google_maps",
-                "tavily_search": "tavily_search", 
-                "web_scraper": "web_scraper",
-                "sec_filing": "sec_filing",
-                "multi_search": "multi_search",
-                "industry_specific": "industry_specific",
-                "directory": "directory",
+                "parallel_discovery": "parallel_discovery",
                 "aggregator": "aggregator",
                 "deduplication": "deduplication",
                 "enricher": "enricher",
@@ -2054,8 +2510,7 @@ class SuperEnhancedDiscoveryWorkflow:
         
         # All nodes return to supervisor for orchestration
         agent_nodes = [
-            "google_maps", "tavily_search", "web_scraper", "sec_filing",
-            "multi_search", "industry_specific", "directory", "aggregator", 
+            "parallel_discovery", "aggregator", 
             "deduplication", "enricher", "exporter", "summary_generator"
         ]
         
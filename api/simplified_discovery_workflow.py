@@ -3,22 +3,82 @@ Simplified Discovery Workflow - Optimized for Railway Deployment
 Removes resource-heavy agents while keeping high-performing core functionality
 """
 
-from typing import Dict, List, TypedDict, Annotated, Sequence
-from langgraph.graph import StateGraph, END
+from typing import Dict, Iterator, List, Optional, TypedDict, Annotated, Sequence
+from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
 import operator
 from loguru import logger
 import json
 import os
-from datetime import datetime
-import pandas as pd
+from datetime import datetime, timedelta
 from pathlib import Path
 import requests
-from bs4 import BeautifulSoup
+import httpx
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 from urllib.parse import urlparse, urljoin
 import re
+import hashlib
+import threading
+import sqlite3
+import asyncio
+import contextlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from discovery_utils import contains_address_signals, invoke_llm_cached, parse_llm_locations
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache
+except ImportError:
+    logger.warning("requests-cache not installed - scraped pages will not be cached")
+    requests_cache = None
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    logger.warning("selectolax not installed - falling back to BeautifulSoup for page parsing")
+    HTMLParser = None
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    logger.warning("rapidfuzz not installed - deduplication will use exact keys only")
+    fuzz = None
+
+
+# ===== LLM RESPONSE CACHE =====
+LLM_CACHE_TTL = 24 * 3600
+
+
+# ===== RUN CHECKPOINTS =====
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "data/cache/checkpoints.db")
+CHECKPOINT_TTL = 3600  # Same as the API's result cache, so a resumed run is never older than a cached one
+CHECKPOINT_PRUNE_INTERVAL = 3600
+
+# Striped by thread_id, so concurrent jobs for one company take turns and later ones reuse the checkpoint
+_CHECKPOINT_THREAD_LOCKS = [threading.Lock() for _ in range(64)]
+_CHECKPOINT_PRUNE_LOCK = threading.Lock()
+_last_checkpoint_prune = 0.0
+
+# Keys of in-flight runs by random token, so no key material enters run config, metadata or checkpoints
+_RUN_API_KEYS: Dict[str, Dict] = {}
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:
+    logger.warning("langgraph-checkpoint-sqlite not installed - discovery runs will not be checkpointed")
+    SqliteSaver = None
 
 
 # ===== STATE DEFINITION =====
@@ -46,12 +106,12 @@ class SimplifiedDiscoveryState(TypedDict):
     
     # Workflow control
     messages: Annotated[Sequence[BaseMessage], operator.add]
-    next_agent: str
     status: str
     errors: List[str]
 
 
 # ===== UTILITY FUNCTIONS =====
+@lru_cache(maxsize=4096)
 def clean_and_validate_url(url: str) -> str:
     """Clean and validate URL with better handling"""
     if not url:
@@ -75,31 +135,221 @@ def clean_and_validate_url(url: str) -> str:
     return ""
 
 
+@lru_cache(maxsize=1)
+def get_openai_http_client() -> httpx.Client:
+    """Keep-alive pool to api.openai.com shared by every run's LLM client"""
+    # Sized for every agent calling concurrently
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        timeout=60
+    )
+
+
+def get_llm(api_key: str = None) -> ChatOpenAI:
+    """gpt-4o-mini client on the shared connection pool; cheap, so built per run rather than cached by key"""
+    return ChatOpenAI(
+        temperature=0,
+        model="gpt-4o-mini",
+        api_key=api_key,
+        http_client=get_openai_http_client()
+    )
+
+
+def run_api_key(config: Optional[RunnableConfig], name: str, env_var: str) -> Optional[str]:
+    """API key registered for this run, falling back to the environment"""
+    token = ((config or {}).get('configurable') or {}).get('api_keys_token')
+    api_keys = _RUN_API_KEYS.get(token) or {}
+    return api_keys.get(name) or os.getenv(env_var)
+
+
+def get_run_llm(config: Optional[RunnableConfig]) -> Optional[ChatOpenAI]:
+    """LLM client for this run's OpenAI key, or None if it can't be created"""
+    try:
+        return get_llm(run_api_key(config, 'openai_api_key', "OPENAI_API_KEY"))
+    except Exception as e:
+        logger.error(f"Failed to initialize OpenAI: {e}")
+        return None
+
+
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "/tmp/scraper_cache")
+HTTP_CACHE_MAX_BYTES = 128_000  # Caching reads a body in full, so keep it within the scraper's streaming cap
+
+
+def response_content_length(response: requests.Response) -> Optional[int]:
+    """Declared body size, or None when the header is missing or malformed"""
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return None
+
+
+def is_cacheable_response(response: requests.Response) -> bool:
+    """Whether a response body is small enough to store in the HTTP cache"""
+    # A body already read is measured as decoded; Content-Length is only the size on the wire
+    if response._content_consumed:
+        return len(response.content) < HTTP_CACHE_MAX_BYTES
+    
+    # Judge streamed responses from headers so rejected bodies are never read just to be measured;
+    # chunked responses have no length, and caching them would read them in full
+    content_length = response_content_length(response)
+    return content_length is not None and content_length < HTTP_CACHE_MAX_BYTES
+
+
+def create_cached_session() -> requests.Session:
+    """Session that reuses small successful GETs from an on-disk cache for a day"""
+    if requests_cache is None:
+        return requests.Session()
+    
+    # Reruns and batches hit the same company pages; skip caching errors and oversized bodies
+    return requests_cache.CachedSession(
+        cache_name=HTTP_CACHE_PATH,
+        backend='sqlite',
+        expire_after=timedelta(hours=24),
+        allowable_codes=(200,),
+        allowable_methods=('GET', 'HEAD'),
+        filter_fn=is_cacheable_response
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shared_session() -> requests.Session:
+    """Keep-alive session shared by every scraping node"""
+    session = create_cached_session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    return session
+
+
+@lru_cache(maxsize=1)
+def create_checkpointer():
+    """SQLite checkpointer shared by every workflow, so repeat runs reuse completed nodes; None if unavailable"""
+    if SqliteSaver is None:
+        return None
+    
+    try:
+        Path(CHECKPOINT_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+        # Discovery runs in worker threads; the saver serializes access to the connection itself
+        return SqliteSaver(sqlite3.connect(CHECKPOINT_DB_PATH, check_same_thread=False))
+    except Exception as e:
+        logger.warning(f"Checkpointer unavailable - discovery runs will not be checkpointed: {e}")
+        return None
+
+
+def delete_checkpoint_threads(checkpointer, max_age: float = None) -> int:
+    """Delete checkpoint threads last written more than max_age seconds ago, or all threads; returns the count"""
+    cutoff = time.time() - max_age if max_age is not None else float('inf')
+    
+    last_written = {}
+    for checkpoint in checkpointer.list(None):
+        thread_id = checkpoint.config['configurable']['thread_id']
+        written = datetime.fromisoformat(checkpoint.checkpoint['ts']).timestamp()
+        last_written[thread_id] = max(written, last_written.get(thread_id, 0.0))
+    
+    expired = [thread_id for thread_id, written in last_written.items() if written < cutoff]
+    for thread_id in expired:
+        checkpointer.delete_thread(thread_id)
+    
+    return len(expired)
+
+
+def prune_checkpoints(checkpointer):
+    """At most hourly, delete threads past CHECKPOINT_TTL; their time bucket has passed, so they are never resumed"""
+    global _last_checkpoint_prune
+    now = time.time()
+    
+    with _CHECKPOINT_PRUNE_LOCK:
+        if now - _last_checkpoint_prune < CHECKPOINT_PRUNE_INTERVAL:
+            return
+        _last_checkpoint_prune = now
+    
+    try:
+        pruned = delete_checkpoint_threads(checkpointer, CHECKPOINT_TTL)
+        if pruned:
+            logger.info(f"Pruned {pruned} expired checkpoint threads")
+    except Exception as e:
+        logger.warning(f"Checkpoint pruning failed: {e}")
+
+
+@contextlib.contextmanager
+def checkpoint_run(config: Dict):
+    """Serialize runs on the config's checkpoint thread and prune expired threads; a no-op without checkpoints"""
+    thread_id = config.get('configurable', {}).get('thread_id')
+    if thread_id is None:
+        yield
+        return
+    
+    with _CHECKPOINT_THREAD_LOCKS[int(thread_id[:8], 16) % len(_CHECKPOINT_THREAD_LOCKS)]:
+        prune_checkpoints(create_checkpointer())
+        yield
+
+
+@contextlib.contextmanager
+def registered_api_keys(api_keys: Dict) -> Iterator[str]:
+    """Hold a run's API keys in process memory for the duration of the run; yields the token to look them up"""
+    token = uuid.uuid4().hex
+    _RUN_API_KEYS[token] = api_keys
+    try:
+        yield token
+    finally:
+        _RUN_API_KEYS.pop(token, None)
+
+
+def dedupe_locations(locations: List[Dict], key_fields: Sequence[tuple]) -> List[Dict]:
+    """Keep the first location per key of lowercased (field, prefix length) values"""
+    seen = set()
+    unique = []
+    
+    for loc in locations:
+        key = tuple((loc.get(field) or '').lower()[:length] for field, length in key_fields)
+        # The leading key field is required
+        if key[0] and key not in seen:
+            seen.add(key)
+            unique.append(loc)
+    
+    return unique
+
+
+def as_state_update(run):
+    """Wrap a node that returns the whole state so its update leaves the append-only messages alone"""
+    def node(state: SimplifiedDiscoveryState) -> Dict:
+        update = dict(run(state))
+        # Returning messages unchanged would make the operator.add reducer append them all again
+        update.pop('messages', None)
+        return update
+    
+    return node
+
+
 # ===== CORE AGENT NODES (SIMPLIFIED) =====
 
 class SimplifiedGoogleMapsAgentNode:
     """Simplified Google Maps agent - fewer search patterns"""
     
-    def __init__(self, api_key: str = None):
+    DEDUP_KEY = (('address', 50),)
+    MAX_CONCURRENT_REQUESTS = 5
+    # Only request what the location record uses; this also keeps details in a cheaper billing tier
+    DETAIL_FIELDS = ['formatted_phone_number', 'website']
+    
+    def __init__(self):
         try:
             import googlemaps
-            self.api_key = api_key or os.getenv("GOOGLE_MAPS_API_KEY")
-            if self.api_key:
-                self.client = googlemaps.Client(key=self.api_key)
-                logger.info("Simplified Google Maps Agent initialized")
-            else:
-                self.client = None
-                logger.warning("Google Maps API key not found - agent disabled")
+            self.googlemaps = googlemaps
+            logger.info("Simplified Google Maps Agent initialized")
         except ImportError:
             logger.warning("googlemaps library not installed - Google Maps agent disabled")
-            self.client = None
+            self.googlemaps = None
     
-    def run(self, state: SimplifiedDiscoveryState) -> SimplifiedDiscoveryState:
+    def run(self, state: SimplifiedDiscoveryState, config: RunnableConfig = None) -> SimplifiedDiscoveryState:
         """Execute simplified Google Maps search"""
         if state.get('google_maps_results') is not None:
             return state
         
-        if not self.client:
+        api_key = run_api_key(config, 'google_maps_api_key', "GOOGLE_MAPS_API_KEY")
+        if not self.googlemaps or not api_key:
             logger.warning("Google Maps client not available")
             state['google_maps_results'] = []
             return state
@@ -108,6 +358,7 @@ class SimplifiedGoogleMapsAgentNode:
         logger.info(f"Google Maps: Simplified search for {company_name}")
         
         try:
+            client = self.googlemaps.Client(key=api_key)
             all_locations = []
             
             # Only 2 search patterns instead of 5
@@ -116,105 +367,93 @@ class SimplifiedGoogleMapsAgentNode:
                 f"{company_name} office"
             ]
             
-            for pattern in search_patterns:
-                try:
-                    places_result = self.client.places(query=pattern, type=None)
-                    
-                    # Limit to 10 results instead of 15
-                    for place in places_result.get('results', [])[:10]:
-                        place_id = place.get('place_id')
-                        
-                        # Get basic details only
-                        details = {}
-                        if place_id:
-                            try:
-                                details = self.client.place(place_id)['result']
-                            except:
-                                pass
-                        
-                        location = {
-                            'name': place.get('name', ''),
-                            'address': place.get('formatted_address', ''),
-                            'city': self._extract_city(place.get('formatted_address', '')),
-                            'phone': details.get('formatted_phone_number', ''),
-                            'website': details.get('website', ''),
-                            'lat': place.get('geometry', {}).get('location', {}).get('lat'),
-                            'lng': place.get('geometry', {}).get('location', {}).get('lng'),
-                            'confidence': 0.9,
-                            'source': 'google_maps'
-                        }
-                        all_locations.append(location)
-                    
-                    time.sleep(0.3)  # Shorter delay
-                    
-                except Exception as e:
-                    logger.error(f"Google Maps search error: {e}")
-                    continue
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+                # Text searches are independent of each other
+                places = [
+                    place
+                    for results in executor.map(lambda pattern: self._search_pattern(client, pattern), search_patterns)
+                    for place in results[:10]  # Limit to 10 results instead of 15
+                ]
+                
+                # Fetch details once per place, even if both patterns returned it
+                place_ids = list({place.get('place_id') for place in places if place.get('place_id')})
+                details_by_id = dict(zip(
+                    place_ids, executor.map(lambda place_id: self._get_place_details(client, place_id), place_ids)
+                ))
+            
+            for place in places:
+                details = details_by_id.get(place.get('place_id'), {})
+                
+                location = {
+                    'name': place.get('name', ''),
+                    'address': place.get('formatted_address', ''),
+                    'city': self._extract_city(place.get('formatted_address', '')),
+                    'phone': details.get('formatted_phone_number', ''),
+                    'website': details.get('website', ''),
+                    'lat': place.get('geometry', {}).get('location', {}).get('lat'),
+                    'lng': place.get('geometry', {}).get('location', {}).get('lng'),
+                    'confidence': 0.9,
+                    'source': 'google_maps'
+                }
+                all_locations.append(location)
             
             # Simple deduplication
-            unique_locations = self._deduplicate_results(all_locations)
+            unique_locations = dedupe_locations(all_locations, self.DEDUP_KEY)
             
             state['google_maps_results'] = unique_locations
             logger.info(f"Google Maps: Found {len(unique_locations)} locations")
             
         except Exception as e:
             logger.error(f"Google Maps error: {e}")
-            state['google_maps_results'] = []
+            # None rather than [] so a checkpointed rerun retries the agent
+            state['google_maps_results'] = None
         
         return state
     
+    def _search_pattern(self, client, pattern: str) -> List[Dict]:
+        """Run a single text search and return its raw place results"""
+        try:
+            return client.places(query=pattern, type=None).get('results', [])
+        except Exception as e:
+            logger.error(f"Google Maps search error: {e}")
+            return []
+    
+    def _get_place_details(self, client, place_id: str) -> Dict:
+        """Get basic details only"""
+        try:
+            return client.place(place_id, fields=self.DETAIL_FIELDS)['result']
+        except:
+            return {}
+    
     def _extract_city(self, address: str) -> str:
         parts = address.split(',')
         if len(parts) >= 3:
             return (parts[-3] or '').strip()
         return ''
-    
-    def _deduplicate_results(self, locations: List[Dict]) -> List[Dict]:
-        seen_addresses = set()
-        unique = []
-        
-        for loc in locations:
-            address_key = (loc.get('address') or '').lower()[:50]
-            if address_key and address_key not in seen_addresses:
-                seen_addresses.add(address_key)
-                unique.append(loc)
-        
-        return unique
 
 
 class SimplifiedTavilySearchAgentNode:
     """Simplified Tavily search - fewer queries"""
     
-    def __init__(self, tavily_api_key: str = None):
-        self.api_key = tavily_api_key or os.getenv("TAVILY_API_KEY")
-        
-        if self.api_key:
-            try:
-                from langchain_community.tools.tavily_search import TavilySearchResults
-                self.search = TavilySearchResults(api_key=self.api_key, max_results=5)  # Reduced
-                logger.info("Simplified Tavily search initialized")
-            except ImportError as e:
-                logger.error(f"langchain-community not installed: {e}")
-                self.search = None
-            except Exception as e:
-                logger.error(f"Failed to initialize Tavily: {e}")
-                self.search = None
-        else:
-            logger.warning("No Tavily API key provided")
-            self.search = None
-        
+    DEDUP_KEY = (('city', None), ('name', 20))
+    
+    def __init__(self):
         try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
-        except Exception as e:
-            logger.error(f"Failed to initialize OpenAI: {e}")
-            self.llm = None
+            from langchain_community.tools.tavily_search import TavilySearchResults
+            self.search_class = TavilySearchResults
+            logger.info("Simplified Tavily search initialized")
+        except ImportError as e:
+            logger.error(f"langchain-community not installed: {e}")
+            self.search_class = None
     
-    def run(self, state: SimplifiedDiscoveryState) -> SimplifiedDiscoveryState:
+    def run(self, state: SimplifiedDiscoveryState, config: RunnableConfig = None) -> SimplifiedDiscoveryState:
         """Simplified Tavily search"""
         if state.get('tavily_search_results') is not None:
             return state
         
-        if not self.search or not self.llm:
+        api_key = run_api_key(config, 'tavily_api_key', "TAVILY_API_KEY")
+        llm = get_run_llm(config)
+        if not self.search_class or not api_key or not llm:
             logger.warning("Tavily search not available")
             state['tavily_search_results'] = []
             return state
@@ -223,6 +462,7 @@ class SimplifiedTavilySearchAgentNode:
         logger.info(f"Tavily: Simplified search for {company_name}")
         
         try:
+            search = self.search_class(api_key=api_key, max_results=5)  # Reduced
             all_locations = []
             
             # Only 3 queries instead of 8
@@ -235,14 +475,14 @@ class SimplifiedTavilySearchAgentNode:
             for query in search_queries:
                 try:
                     logger.info(f"Tavily: Searching '{query}'")
-                    results = self.search.invoke(query)
+                    results = search.invoke(query)
                     
                     # Process only first result
                     for result in results[:1]:
                         content = result.get('content', '')[:2000]  # Reduced content
                         
-                        if len(content) > 100:
-                            locations = self._extract_locations_with_llm(content, company_name)
+                        if len(content) > 100 and contains_address_signals(content):
+                            locations = self._extract_locations_with_llm(llm, content, company_name)
                             all_locations.extend(locations)
                     
                     time.sleep(1)
@@ -251,18 +491,19 @@ class SimplifiedTavilySearchAgentNode:
                     logger.error(f"Tavily search error: {e}")
                     continue
             
-            unique_locations = self._deduplicate_results(all_locations)
+            unique_locations = dedupe_locations(all_locations, self.DEDUP_KEY)
             
             state['tavily_search_results'] = unique_locations
             logger.info(f"Tavily: Found {len(unique_locations)} locations")
             
         except Exception as e:
             logger.error(f"Tavily error: {e}")
-            state['tavily_search_results'] = []
+            # None rather than [] so a checkpointed rerun retries the agent
+            state['tavily_search_results'] = None
         
         return state
     
-    def _extract_locations_with_llm(self, content: str, company_name: str) -> List[Dict]:
+    def _extract_locations_with_llm(self, llm: ChatOpenAI, content: str, company_name: str) -> List[Dict]:
         """Simplified LLM extraction"""
         
         prompt = f"""Extract ONLY real, specific locations for {company_name} from this content.
@@ -274,74 +515,62 @@ STRICT REQUIREMENTS:
 2. Must have at least a city name from the content
 3. NO fake or generic locations
 
-Return JSON array with:
+Each location has:
 - name: Location name
 - address: Full address (if available)
 - city: City name (required)
 - state: State/province (if available)
 - country: Country (if available)
 
-Return [] if no specific locations found.
+Return a JSON object of the form {{"locations": [...]}}. If no specific locations found, return {{"locations": []}}
 """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response_content = invoke_llm_cached(llm, prompt, json_mode=True, ttl=LLM_CACHE_TTL)
             
-            json_match = re.search(r'\[.*?\]', response.content, re.DOTALL)
-            if json_match:
-                locs = json.loads(json_match.group())
-                validated_locations = []
-                
-                for loc in locs:
-                    if loc and isinstance(loc, dict) and loc.get('city'):
-                        city = (loc.get('city') or '').lower()
-                        if city in content.lower():  # Validate city appears in content
-                            loc['source'] = 'tavily'
-                            loc['confidence'] = 0.8
-                            validated_locations.append(loc)
-                
-                return validated_locations
+            validated_locations = []
+            content_lower = content.lower()
+            
+            for loc in parse_llm_locations(response_content):
+                if loc.get('city'):
+                    city = (loc.get('city') or '').lower()
+                    if city in content_lower:  # Validate city appears in content
+                        loc['source'] = 'tavily'
+                        loc['confidence'] = 0.8
+                        validated_locations.append(loc)
+            
+            return validated_locations
                 
         except Exception as e:
             logger.error(f"Tavily LLM extraction error: {e}")
         
         return []
-    
-    def _deduplicate_results(self, locations: List[Dict]) -> List[Dict]:
-        seen = set()
-        unique = []
-        
-        for loc in locations:
-            key = ((loc.get('city') or '').lower(), (loc.get('name') or '')[:20].lower())
-            if key not in seen and loc.get('city'):
-                seen.add(key)
-                unique.append(loc)
-        
-        return unique
 
 
 class SimplifiedWebScraperAgentNode:
     """Simplified web scraper - fewer pages"""
     
+    DEDUP_KEY = (('city', None), ('address', 30))
+    NOISE_TAGS = ['script', 'style', 'meta']
+    # Basic keywords only
+    LINK_KEYWORD_RE = re.compile(r"location|office|contact|about|careers", re.IGNORECASE)
+    MAX_LOCATION_URLS = 10
+    
+    # Only the first 3000 chars of page text are used, so never pull multi-MB bodies
+    MAX_PAGE_BYTES = HTTP_CACHE_MAX_BYTES
+    MAX_CONTENT_LENGTH = 5_000_000
+    
     def __init__(self):
-        try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
-        except Exception as e:
-            logger.error(f"Failed to initialize OpenAI: {e}")
-            self.llm = None
-            
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session = get_shared_session()
         logger.info("Simplified Web Scraper initialized")
   
-    def run(self, state: SimplifiedDiscoveryState) -> SimplifiedDiscoveryState:
+    def run(self, state: SimplifiedDiscoveryState, config: RunnableConfig = None) -> SimplifiedDiscoveryState:
         """Simplified web scraping"""
         if state.get('web_scraper_results') is not None:
             return state
         
-        if not self.llm:
+        llm = get_run_llm(config)
+        if not llm:
             logger.warning("Web scraper disabled - no OpenAI client")
             state['web_scraper_results'] = []
             return state
@@ -363,126 +592,187 @@ class SimplifiedWebScraperAgentNode:
             location_urls = self._find_basic_location_pages(company_url)
             logger.info(f"Found {len(location_urls)} pages to scrape")
             
-            for url in location_urls[:5]:  # Limit to 5 pages
-                try:
-                    logger.info(f"Scraping: {url}")
-                    response = self.session.get(url, timeout=15)
-                    
-                    if response.status_code == 200:
-                        locations = self._extract_locations_from_page(response.text, company_name)
-                        all_locations.extend(locations)
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}")
-                    continue
+            # Pages are independent, so fetch them concurrently
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                pages = [
+                    page for page in executor.map(self._fetch_page, location_urls[:5])  # Limit to 5 pages
+                    if page
+                ]
+            
+            # One LLM call covers every scraped page
+            if pages:
+                all_locations = self._extract_locations_with_llm(llm, pages, company_name)
             
-            unique_locations = self._deduplicate_results(all_locations)
+            unique_locations = dedupe_locations(all_locations, self.DEDUP_KEY)
             
             state['web_scraper_results'] = unique_locations
             logger.info(f"Web Scraper: Found {len(unique_locations)} locations")
             
         except Exception as e:
             logger.error(f"Web scraper error: {e}")
-            state['web_scraper_results'] = []
+            # None rather than [] so a checkpointed rerun retries the agent
+            state['web_scraper_results'] = None
         
         return state
     
     def _find_basic_location_pages(self, base_url: str) -> List[str]:
         """Find basic location pages - simplified"""
         location_urls = [base_url]
+        seen = {base_url}
         
         try:
-            response = self.session.get(base_url, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Basic keywords only
-                location_keywords = [
-                    'location', 'office', 'contact', 'about', 'careers'
-                ]
-                
-                for link in soup.find_all('a', href=True)[:20]:  # Limit links
-                    href = (link.get('href') or '').lower()
-                    text = (link.get_text() or '').lower().strip()
+            html_content = self._get_capped_html(base_url, 10)
+            if html_content:
+                for href, text in self._parse_links(html_content)[:20]:  # Limit links
+                    if not (self.LINK_KEYWORD_RE.search(href or '') or self.LINK_KEYWORD_RE.search(text or '')):
+                        continue
                     
-                    if any(keyword in f"{href} {text}" for keyword in location_keywords):
-                        full_url = self._build_full_url(link.get('href'), base_url)
-                        if full_url and self._is_same_domain(full_url, base_url):
-                            location_urls.append(full_url)
+                    full_url = self._build_full_url(href, base_url)
+                    if full_url and full_url not in seen and self._is_same_domain(full_url, base_url):
+                        seen.add(full_url)
+                        location_urls.append(full_url)
+                        
+                        if len(location_urls) >= self.MAX_LOCATION_URLS:
+                            break
         
         except Exception as e:
             logger.error(f"Basic page discovery error: {e}")
         
-        return location_urls[:10]  # Return max 10 URLs
+        return location_urls
     
-    def _extract_locations_from_page(self, html_content: str, company_name: str) -> List[Dict]:
-        """Simplified location extraction"""
-        locations = []
+    def _parse_links(self, html_content: str) -> List[tuple]:
+        """Return (href, text) for every link on the page"""
+        if SELECTOLAX_AVAILABLE:
+            return [
+                (node.attributes.get('href'), node.text())
+                for node in HTMLParser(html_content).css('a[href]')
+            ]
         
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=SoupStrainer('a', href=True))
+        return [(link.get('href'), link.get_text()) for link in soup.find_all('a', href=True)]
+    
+    def _fetch_page(self, url: str) -> Dict:
+        """Fetch a page and return its visible text, or None if unusable"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            logger.info(f"Scraping: {url}")
+            html_content = self._get_capped_html(url, 15)
+            
+            if html_content:
+                text = self._extract_page_text(html_content)
+                # Pages with no address signals would only cost tokens in the batched prompt
+                if len(text) > 100 and contains_address_signals(text):
+                    return {'url': url, 'content': text}
+        
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+        
+        return None
+    
+    def _get_capped_html(self, url: str, timeout: int) -> Optional[str]:
+        """GET an HTML page, reading at most MAX_PAGE_BYTES of the body"""
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            content_type = response.headers.get('Content-Type', '')
+            content_length = response_content_length(response) or 0
             
-            # Remove noise
-            for element in soup(['script', 'style', 'meta']):
-                element.decompose()
+            # Skip errors, non-HTML files and giant downloads before reading any of the body
+            if (response.status_code != 200 or (content_type and 'html' not in content_type)
+                    or content_length > self.MAX_CONTENT_LENGTH):
+                return None
             
-            text = soup.get_text(separator=' ', strip=True)[:3000]  # Reduced content
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body.extend(chunk)
+                if len(body) >= self.MAX_PAGE_BYTES:
+                    break
+            
+            return bytes(body[:self.MAX_PAGE_BYTES]).decode(response.encoding or 'utf-8', errors='replace')
+    
+    def _extract_page_text(self, html_content: str) -> str:
+        """Simplified page text extraction"""
+        try:
+            if SELECTOLAX_AVAILABLE:
+                tree = HTMLParser(html_content)
+                
+                # Remove noise
+                tree.strip_tags(self.NOISE_TAGS)
+                
+                text = tree.root.text(separator=' ', strip=True) if tree.root else ''
+            else:
+                soup = BeautifulSoup(html_content, 'lxml')
+                
+                # Remove noise
+                for element in soup(self.NOISE_TAGS):
+                    element.decompose()
+                
+                text = soup.get_text(separator=' ', strip=True)
             
-            if len(text) > 100:
-                locations = self._extract_locations_with_llm(text, company_name)
+            return text[:3000]  # Reduced content
         
         except Exception as e:
             logger.error(f"Page extraction error: {e}")
         
-        return locations
+        return ""
     
-    def _extract_locations_with_llm(self, content: str, company_name: str) -> List[Dict]:
-        """Simplified LLM extraction"""
+    def _extract_locations_with_llm(self, llm: ChatOpenAI, pages: List[Dict], company_name: str) -> List[Dict]:
+        """Extract locations from every scraped page in a single call"""
+        
+        pages_block = "\n\n".join(
+            f"[Page {i}]\nURL: {page['url']}\nContent: {page['content']}"
+            for i, page in enumerate(pages, 1)
+        )
         
-        prompt = f"""Extract office locations for {company_name} from this content.
+        prompt = f"""Extract office locations for {company_name} from these pages.
 
-Content: {content}
+{pages_block}
 
 REQUIREMENTS:
 1. Only extract locations explicitly mentioned
 2. Must have at least a city name from the content
 3. Include addresses when available
 
-Return JSON array with:
+Each location has:
+- page: Number of the page the location came from
 - name: Location name
 - address: Street address (if available)
 - city: City name (required)
 - state: State (if available)
 - country: Country (if available)
 
-Return [] if no locations found.
+Return a JSON object of the form {{"locations": [...]}}. If no locations found, return {{"locations": []}}
 """
         
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
+            response_content = invoke_llm_cached(llm, prompt, json_mode=True, ttl=LLM_CACHE_TTL)
             
-            json_match = re.search(r'\[.*?\]', response.content, re.DOTALL)
-            if json_match:
-                locs = json.loads(json_match.group())
-                
-                validated_locations = []
-                for loc in locs:
-                    if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
-                        city = (loc.get('city') or '').lower()
-                        if city in content.lower():
-                            loc['source'] = 'company_website'
-                            loc['confidence'] = 0.85
-                            validated_locations.append(loc)
-                
-                return validated_locations
+            validated_locations = []
+            pages_lower = [page['content'].lower() for page in pages]
+            for loc in parse_llm_locations(response_content):
+                if loc.get('city') and len((loc.get('city') or '').strip()) > 1:
+                    city = (loc.get('city') or '').lower()
+                    content_lower = self._resolve_page(loc.pop('page', None), pages_lower)
+                    if city in content_lower:
+                        loc['source'] = 'company_website'
+                        loc['confidence'] = 0.85
+                        validated_locations.append(loc)
+            
+            return validated_locations
         
         except Exception as e:
             logger.error(f"LLM extraction error: {e}")
         
         return []
     
+    def _resolve_page(self, page_number, pages_lower: List[str]) -> str:
+        """Map the LLM's page number back to its text, or all pages if unknown"""
+        try:
+            index = int(page_number)
+            if 1 <= index <= len(pages_lower):
+                return pages_lower[index - 1]
+        except (TypeError, ValueError):
+            pass
+        
+        return ' '.join(pages_lower)
+    
     def _build_full_url(self, href: str, base_url: str) -> str:
         try:
             if href.startswith('http'):
@@ -499,37 +789,21 @@ Return [] if no locations found.
             return urlparse(url).netloc == urlparse(base_url).netloc
         except:
             return False
-    
-    def _deduplicate_results(self, locations: List[Dict]) -> List[Dict]:
-        seen = set()
-        unique = []
-        
-        for loc in locations:
-            key = ((loc.get('city') or '').lower(), (loc.get('address') or '')[:30].lower())
-            if key not in seen and loc.get('city'):
-                seen.add(key)
-                unique.append(loc)
-        
-        return unique
 
 
 class SimplifiedBusinessDirectoryAgentNode:
     """Simplified business directory search"""
     
     def __init__(self):
-        try:
-            self.llm = ChatOpenAI(temperature=0, model="gpt-4o-mini")
-        except:
-            self.llm = None
-        self.session = requests.Session()
+        self.session = get_shared_session()
         logger.info("Simplified Business Directory Agent initialized")
     
-    def run(self, state: SimplifiedDiscoveryState) -> SimplifiedDiscoveryState:
+    def run(self, state: SimplifiedDiscoveryState, config: RunnableConfig = None) -> SimplifiedDiscoveryState:
         """Simplified directory search"""
         if state.get('directory_results') is not None:
             return state
         
-        if not self.llm:
+        if not get_run_llm(config):
             logger.warning("Directory agent disabled")
             state['directory_results'] = []
             return state
@@ -547,24 +821,45 @@ class SimplifiedBusinessDirectoryAgentNode:
             
         except Exception as e:
             logger.error(f"Directory error: {e}")
-            state['directory_results'] = []
+            # None rather than [] so a checkpointed rerun retries the agent
+            state['directory_results'] = None
         
         return state
 
 
 # ===== PROCESSING NODES (SIMPLIFIED) =====
 
+class DiscoveryBranchNode:
+    """Run one discovery agent as a parallel graph branch"""
+    
+    def __init__(self, result_key: str, agent_node):
+        self.result_key = result_key
+        self.agent_node = agent_node
+    
+    def run(self, state: SimplifiedDiscoveryState, config: RunnableConfig) -> Dict:
+        """Return only the agent's own result key, so concurrent branches never write the same field"""
+        if state.get(self.result_key) is not None:
+            return {}
+        
+        # A failed agent leaves None, which later stages read as no results and reruns retry
+        try:
+            return {self.result_key: self.agent_node.run(dict(state), config).get(self.result_key)}
+        except Exception as e:
+            logger.error(f"Discovery branch error for {self.result_key}: {e}")
+            return {self.result_key: None}
+
+
 class SimplifiedAggregatorNode:
     """Simplified aggregator"""
     
+    # Later stage outputs, all derived from all_locations
+    DOWNSTREAM_KEYS = ('deduplicated_locations', 'enriched_locations', 'final_locations', 'summary', 'export_files')
+    
     def __init__(self):
         logger.info("Simplified Aggregator initialized")
     
     def run(self, state: SimplifiedDiscoveryState) -> SimplifiedDiscoveryState:
         """Combine results from core agents only"""
-        if state.get('all_locations') is not None:
-            return state
-        
         all_locations = []
         
         # Only core sources
@@ -574,11 +869,18 @@ class SimplifiedAggregatorNode:
         ]
         
         for source in sources:
-            locations = state.get(source, [])
+            locations = state.get(source) or []
             if locations:
                 logger.info(f"Aggregating {len(locations)} locations from {source}")
                 all_locations.extend(locations)
         
+        # Combining is cheap, so it always reruns; if a resumed run retried a failed agent,
+        # the checkpointed later stages are stale and must be rebuilt
+        previous = state.get('all_locations')
+        if previous is not None and previous != all_locations:
+            for key in self.DOWNSTREAM_KEYS:
+                state[key] = None
+        
         state['all_locations'] = all_locations
         logger.info(f"Aggregated {len(all_locations)} total locations")
         
@@ -588,6 +890,14 @@ class SimplifiedAggregatorNode:
 class SimplifiedDeduplicationNode:
     """Simplified deduplication"""
     
+    FUZZY_MATCH_CUTOFF = 88
+    # Legal suffixes dropped before comparing names, so "Acme Corp." matches "Acme Corporation"
+    NAME_SUFFIX_RE = re.compile(r"\b(?:inc|incorporated|corp|corporation|co|company|llc|ltd|limited|plc|gmbh)\b")
+    # rapidfuzz scorers don't strip punctuation themselves
+    PUNCTUATION_RE = re.compile(r"[\W_]+")
+    # Text fields of a cleaned location, in output order
+    TEXT_FIELDS = ('name', 'address', 'city', 'state', 'country', 'phone', 'website')
+    
     def __init__(self):
         logger.info("Simplified Deduplication initialized")
     
@@ -608,38 +918,64 @@ class SimplifiedDeduplicationNode:
         return state
     
     def _basic_deduplicate(self, locations: List[Dict]) -> List[Dict]:
-        """Basic deduplication by city and name"""
-        seen = set()
+        """Deduplication by city and name, then fuzzy name/address matching within a city"""
+        seen = {}
+        # Near-duplicates always share a city, so candidates are only compared within it
+        buckets = {}
+        # (name, address) comparison keys, aligned with unique
+        match_keys = []
         unique = []
         
         for loc in locations:
-            city = (loc.get('city') or '').lower().strip()
-            name = (loc.get('name') or '').lower().strip()
+            # Strip every text field once; keys are lowercase views of the cleaned values
+            cleaned_loc = {field: (loc.get(field) or '').strip() for field in self.TEXT_FIELDS}
+            city = cleaned_loc['city'].lower()
+            name = cleaned_loc['name'].lower()
             
             if not city or len(city) < 2:
                 continue
             
-            key = f"{city}_{name[:20]}"
-            
-            if key not in seen:
-                seen.add(key)
-                # Clean up the location data
-                cleaned_loc = {
-                    'name': (loc.get('name') or '').strip(),
-                    'address': (loc.get('address') or '').strip(),
-                    'city': city.title(),
-                    'state': (loc.get('state') or '').strip(),
-                    'country': (loc.get('country') or '').strip(),
-                    'phone': (loc.get('phone') or '').strip(),
-                    'website': (loc.get('website') or '').strip(),
-                    'lat': loc.get('lat', ''),
-                    'lng': loc.get('lng', ''),
-                    'confidence': loc.get('confidence', 0.5),
-                    'source': loc.get('source', 'unknown')
-                }
+            key = (city, name[:20])
+            name_key = self.PUNCTUATION_RE.sub(' ', self.NAME_SUFFIX_RE.sub(' ', name)).strip()
+            address_key = self.PUNCTUATION_RE.sub(' ', cleaned_loc['address'].lower()[:40]).strip()
+            bucket = buckets.setdefault(city, [])
+            
+            match = seen.get(key)
+            if match is None and fuzz is not None:
+                match = next((index for index in bucket if self._same_place(name_key, address_key, *match_keys[index])), None)
+            
+            # Clean up the location data
+            cleaned_loc['city'] = city.title()
+            cleaned_loc['lat'] = loc.get('lat', '')
+            cleaned_loc['lng'] = loc.get('lng', '')
+            cleaned_loc['confidence'] = loc.get('confidence', 0.5)
+            cleaned_loc['source'] = loc.get('source', 'unknown')
+            
+            if match is None:
+                seen[key] = len(unique)
+                bucket.append(len(unique))
+                match_keys.append((name_key, address_key))
                 unique.append(cleaned_loc)
+            elif self._detail(cleaned_loc) > self._detail(unique[match]):
+                # Keep whichever record says more about the place
+                unique[match] = cleaned_loc
+                match_keys[match] = (name_key, address_key)
         
         return unique
+    
+    def _same_place(self, name: str, address: str, other_name: str, other_address: str) -> bool:
+        """Whether two records in one city are the same place; a missing address fits any address"""
+        # token_sort_ratio, unlike token_set_ratio, doesn't score a name contained in a longer one as 100,
+        # so a vague "Acme Seattle" can't swallow "Acme Seattle Distribution Center"
+        if fuzz.token_sort_ratio(name, other_name) < self.FUZZY_MATCH_CUTOFF:
+            return False
+        
+        # Same name: "100 Main St" and "100 Main St Ste 4" are one place, "500 Pine St" is another
+        return not address or not other_address or fuzz.token_set_ratio(address, other_address) >= self.FUZZY_MATCH_CUTOFF
+    
+    def _detail(self, cleaned_loc: Dict) -> tuple:
+        """How much a record says about its place: filled text fields, then address length"""
+        return (sum(1 for field in self.TEXT_FIELDS if cleaned_loc[field]), len(cleaned_loc['address']))
 
 
 class SimplifiedEnrichmentNode:
@@ -705,8 +1041,21 @@ class SimplifiedExportNode:
             'locations': locations
         }
         
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, default=str, ensure_ascii=False)
+        if orjson:
+            # orjson produces UTF-8 bytes directly and keeps its native encoder with indentation on
+            json_bytes = orjson.dumps(export_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            json_bytes = json.dumps(export_data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+        
+        # Only report the file once it is on disk
+        try:
+            with open(json_file, 'wb') as f:
+                f.write(json_bytes)
+        except OSError as e:
+            logger.error(f"Export write failed for {json_file}: {e}")
+            state['errors'] = state.get('errors', []) + [f"Export failed: {e}"]
+            state['export_files'] = []
+            return state
         
         state['export_files'] = [str(json_file)]
         logger.info(f"Simple export completed: {len(locations)} locations")
@@ -731,10 +1080,10 @@ class SimplifiedSummaryNode:
             'timestamp': datetime.now().isoformat(),
             'total_locations': len(state.get('final_locations', [])),
             'sources_used': {
-                'google_maps': len(state.get('google_maps_results', [])),
-                'tavily': len(state.get('tavily_search_results', [])),
-                'website': len(state.get('web_scraper_results', [])),
-                'directory': len(state.get('directory_results', []))
+                'google_maps': len(state.get('google_maps_results') or []),
+                'tavily': len(state.get('tavily_search_results') or []),
+                'website': len(state.get('web_scraper_results') or []),
+                'directory': len(state.get('directory_results') or [])
             }
         }
         
@@ -744,154 +1093,166 @@ class SimplifiedSummaryNode:
         return state
 
 
-class SimplifiedSupervisorNode:
-    """Simplified supervisor"""
-    
-    def __init__(self):
-        logger.info("Simplified Supervisor initialized")
-    
-    def run(self, state: SimplifiedDiscoveryState) -> SimplifiedDiscoveryState:
-        """Route to next agent - simplified workflow"""
-        
-        agents_status = {
-            'google_maps': state.get('google_maps_results') is not None,
-            'tavily_search': state.get('tavily_search_results') is not None,
-            'web_scraper': state.get('web_scraper_results') is not None,
-            'directory': state.get('directory_results') is not None,
-            'aggregated': state.get('all_locations') is not None,
-            'deduplicated': state.get('deduplicated_locations') is not None,
-            'enriched': state.get('enriched_locations') is not None,
-            'exported': state.get('export_files') is not None,
-            'summary': state.get('summary') is not None
-        }
-        
-        # Simplified workflow order
-        if not agents_status['google_maps']:
-            state['next_agent'] = 'google_maps'
-        elif not agents_status['tavily_search']:
-            state['next_agent'] = 'tavily_search'
-        elif not agents_status['web_scraper']:
-            state['next_agent'] = 'web_scraper'
-        elif not agents_status['directory']:
-            state['next_agent'] = 'directory'
-        elif not agents_status['aggregated']:
-            state['next_agent'] = 'aggregator'
-        elif not agents_status['deduplicated']:
-            state['next_agent'] = 'deduplication'
-        elif not agents_status['enriched']:
-            state['next_agent'] = 'enricher'
-        elif not agents_status['exported']:
-            state['next_agent'] = 'exporter'
-        elif not agents_status['summary']:
-            state['next_agent'] = 'summary'
-        else:
-            state['next_agent'] = 'end'
-        
-        logger.info(f"Simplified Supervisor: Next agent is {state['next_agent']}")
-        return state
-
-
 # ===== MAIN SIMPLIFIED WORKFLOW CLASS =====
 
 class SimplifiedDiscoveryWorkflow:
     """Simplified multi-agent discovery workflow optimized for Railway deployment"""
     
+    # Node outputs in state; each node skips its work while its output is set
+    OUTPUT_KEYS = (
+        'google_maps_results', 'tavily_search_results', 'web_scraper_results', 'directory_results',
+        'all_locations', 'deduplicated_locations', 'enriched_locations', 'final_locations',
+        'summary', 'export_files'
+    )
+    
     def __init__(self, output_dir: str = "temp/output", api_keys: dict = None):
         """Initialize simplified workflow"""
-        
-        # Store API keys
+        # Keys are registered per run rather than held by the nodes, so every instance shares one compiled graph
         self.api_keys = api_keys or {}
-        if api_keys:
-            if api_keys.get('openai_api_key'):
-                os.environ['OPENAI_API_KEY'] = api_keys['openai_api_key']
-            if api_keys.get('google_maps_api_key'):
-                os.environ['GOOGLE_MAPS_API_KEY'] = api_keys['google_maps_api_key']
-            if api_keys.get('tavily_api_key'):
-                os.environ['TAVILY_API_KEY'] = api_keys['tavily_api_key']
-        
-        # Initialize simplified nodes
-        self.google_maps_node = SimplifiedGoogleMapsAgentNode(
-            api_key=api_keys.get('google_maps_api_key') if api_keys else None
-        )
-        self.tavily_node = SimplifiedTavilySearchAgentNode(
-            tavily_api_key=api_keys.get('tavily_api_key') if api_keys else None
-        )
-        self.web_scraper_node = SimplifiedWebScraperAgentNode()
-        self.directory_node = SimplifiedBusinessDirectoryAgentNode()
-        
-        # Processing nodes
-        self.aggregator_node = SimplifiedAggregatorNode()
-        self.deduplication_node = SimplifiedDeduplicationNode()
-        self.enrichment_node = SimplifiedEnrichmentNode()
-        self.export_node = SimplifiedExportNode(output_dir)
-        self.summary_node = SimplifiedSummaryNode()
-        self.supervisor_node = SimplifiedSupervisorNode()
-        
-        # Build the graph
-        self.graph = self._build_graph()
+        self.checkpointer = create_checkpointer()
+        self.graph = self._compiled_graph(output_dir)
         
         logger.info("Simplified Discovery Workflow initialized")
         logger.info("Optimizations: Fewer agents, reduced queries, limited pages, basic export")
     
-    def _build_graph(self) -> StateGraph:
-        """Build simplified workflow graph"""
+    @classmethod
+    def clear_checkpoints(cls):
+        """Delete every checkpoint thread, so the next run of each company starts from scratch"""
+        checkpointer = create_checkpointer()
+        if checkpointer is not None:
+            cleared = delete_checkpoint_threads(checkpointer)
+            logger.info(f"Cleared {cleared} checkpoint threads")
+    
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _compiled_graph(cls, output_dir: str):
+        """Build the nodes and compile the graph once per output dir; nodes keep no keys or run state"""
+        # The agents share no state until aggregation, so they run as parallel graph branches
+        discovery_branches = {
+            'google_maps': DiscoveryBranchNode('google_maps_results', SimplifiedGoogleMapsAgentNode()),
+            'tavily_search': DiscoveryBranchNode('tavily_search_results', SimplifiedTavilySearchAgentNode()),
+            'web_scraper': DiscoveryBranchNode('web_scraper_results', SimplifiedWebScraperAgentNode()),
+            'directory': DiscoveryBranchNode('directory_results', SimplifiedBusinessDirectoryAgentNode())
+        }
+        
         workflow = StateGraph(SimplifiedDiscoveryState)
         
         # Add nodes
-        workflow.add_node("supervisor", self.supervisor_node.run)
-        workflow.add_node("google_maps", self.google_maps_node.run)
-        workflow.add_node("tavily_search", self.tavily_node.run)
-        workflow.add_node("web_scraper", self.web_scraper_node.run)
-        workflow.add_node("directory", self.directory_node.run)
-        workflow.add_node("aggregator", self.aggregator_node.run)
-        workflow.add_node("deduplication", self.deduplication_node.run)
-        workflow.add_node("enricher", self.enrichment_node.run)
-        workflow.add_node("exporter", self.export_node.run)
-        workflow.add_node("summary_generator", self.summary_node.run)
-        
-        # Set entry point
-        workflow.set_entry_point("supervisor")
-        
-        # Define routing
-        def route_next(state):
-            return state.get('next_agent', 'end')
-        
-        # Add conditional edges
-        workflow.add_conditional_edges(
-            "supervisor",
-            route_next,
-            {
-                "google_maps": "google_maps",
-                "tavily_search": "tavily_search", 
-                "web_scraper": "web_scraper",
-                "directory": "directory",
-                "aggregator": "aggregator",
-                "deduplication": "deduplication",
-                "enricher": "enricher",
-                "exporter": "exporter",
-                "summary": "summary_generator",
-                "end": END
-            }
-        )
+        for name, branch in discovery_branches.items():
+            workflow.add_node(name, branch.run)
+        workflow.add_node("aggregator", as_state_update(SimplifiedAggregatorNode().run))
+        workflow.add_node("deduplication", as_state_update(SimplifiedDeduplicationNode().run))
+        workflow.add_node("enricher", as_state_update(SimplifiedEnrichmentNode().run))
+        workflow.add_node("exporter", as_state_update(SimplifiedExportNode(output_dir).run))
+        workflow.add_node("summary_generator", as_state_update(SimplifiedSummaryNode().run))
+        
+        # The pipeline is fixed, so it is wired with static edges instead of a routing supervisor.
+        # Discovery agents fan out from the start and join at the aggregator once all have finished.
+        discovery_nodes = list(discovery_branches)
+        for name in discovery_nodes:
+            workflow.add_edge(START, name)
+        workflow.add_edge(discovery_nodes, "aggregator")
+        
+        workflow.add_edge("aggregator", "deduplication")
+        workflow.add_edge("deduplication", "enricher")
+        workflow.add_edge("enricher", "exporter")
+        workflow.add_edge("exporter", "summary_generator")
+        workflow.add_edge("summary_generator", END)
+        
+        return workflow.compile(checkpointer=create_checkpointer())
+    
+    def discover(self, company_name: str, company_url: str = None, force_refresh: bool = False) -> Dict:
+        """Run simplified discovery"""
+        logger.info(f"Starting SIMPLIFIED discovery for {company_name}")
         
-        # All nodes return to supervisor
-        agent_nodes = [
-            "google_maps", "tavily_search", "web_scraper", "directory",
-            "aggregator", "deduplication", "enricher", "exporter", "summary_generator"
-        ]
+        cleaned_url = clean_and_validate_url(company_url) if company_url else ""
         
-        for node in agent_nodes:
-            workflow.add_edge(node, "supervisor")
+        try:
+            result = {}
+            for event in self._stream(company_name, cleaned_url, force_refresh):
+                if event['node'] is None:
+                    result = event['state_delta']
+            return self._build_result(company_name, cleaned_url, result)
+            
+        except Exception as e:
+            logger.error(f"Simplified workflow error: {e}")
+            return self._build_error_result(company_name, cleaned_url, e)
+    
+    def discover_stream(self, company_name: str, company_url: str = None, force_refresh: bool = False) -> Iterator[Dict]:
+        """Yield {'node', 'state_delta'} as each graph node finishes, so callers can report progress"""
+        logger.info(f"Starting SIMPLIFIED discovery stream for {company_name}")
         
-        return workflow.compile()
+        cleaned_url = clean_and_validate_url(company_url) if company_url else ""
+        for event in self._stream(company_name, cleaned_url, force_refresh):
+            if event['node'] is not None:
+                yield event
     
-    def discover(self, company_name: str, company_url: str = None) -> Dict:
-        """Run simplified discovery"""
+    def _stream(self, company_name: str, cleaned_url: str, force_refresh: bool) -> Iterator[Dict]:
+        """Stream node updates plus full state snapshots (node None); resumed checkpoints skip nodes, so updates alone can't rebuild the result"""
+        with registered_api_keys(self.api_keys) as api_keys_token:
+            config = self._graph_config(company_name, cleaned_url, api_keys_token)
+            
+            with checkpoint_run(config):
+                for mode, chunk in self.graph.stream(
+                    self._initial_state(company_name, cleaned_url, force_refresh),
+                    config=config,
+                    stream_mode=["updates", "values"]
+                ):
+                    if mode == "values":
+                        yield {'node': None, 'state_delta': chunk}
+                        continue
+                    
+                    for node_name, state_delta in chunk.items():
+                        yield {'node': node_name, 'state_delta': state_delta or {}}
+    
+    async def adiscover(self, company_name: str, company_url: str = None, force_refresh: bool = False) -> Dict:
+        """Run simplified discovery from an event loop without blocking it"""
         logger.info(f"Starting SIMPLIFIED discovery for {company_name}")
         
         cleaned_url = clean_and_validate_url(company_url) if company_url else ""
+        initial_state = self._initial_state(company_name, cleaned_url, force_refresh)
+        
+        try:
+            with registered_api_keys(self.api_keys) as api_keys_token:
+                config = self._graph_config(company_name, cleaned_url, api_keys_token)
+                
+                if self.checkpointer is not None:
+                    # SqliteSaver is synchronous only, so checkpointed runs go through a worker thread
+                    result = await asyncio.to_thread(self._invoke_checkpointed, initial_state, config)
+                else:
+                    # Sync nodes run on LangGraph's executor, so the discovery branches still overlap their I/O
+                    result = await self.graph.ainvoke(initial_state, config=config)
+            return self._build_result(company_name, cleaned_url, result)
+            
+        except Exception as e:
+            logger.error(f"Simplified workflow error: {e}")
+            return self._build_error_result(company_name, cleaned_url, e)
+    
+    def _invoke_checkpointed(self, initial_state: Dict, config: Dict) -> Dict:
+        """Invoke the graph while holding its checkpoint thread"""
+        with checkpoint_run(config):
+            return self.graph.invoke(initial_state, config)
+    
+    def _graph_config(self, company_name: str, cleaned_url: str, api_keys_token: str) -> Dict:
+        """Graph config; runs for the same company, URL and enabled agents share a checkpoint thread for CHECKPOINT_TTL"""
+        config = {
+            "recursion_limit": 12,  # Six steps end to end
+            # Nodes look the keys up by token, so only the token is copied into run and checkpoint metadata
+            "configurable": {"api_keys_token": api_keys_token}
+        }
         
-        initial_state = {
+        if self.checkpointer is not None:
+            enabled_agents = ','.join(sorted(name for name, key in self.api_keys.items() if key))
+            thread_key = f"{company_name}|{cleaned_url}|{enabled_agents}|{int(time.time() // CHECKPOINT_TTL)}"
+            
+            # Nodes skip work whose output is already in state, so a resumed thread only runs what is missing
+            config["configurable"]["thread_id"] = hashlib.sha1(thread_key.encode('utf-8')).hexdigest()
+        
+        return config
+    
+    def _initial_state(self, company_name: str, cleaned_url: str, force_refresh: bool = False) -> Dict:
+        """Initial graph state for a discovery run"""
+        state = {
             'company_name': company_name,
             'company_url': cleaned_url,
             'messages': [
@@ -900,46 +1261,47 @@ class SimplifiedDiscoveryWorkflow:
             'errors': []
         }
         
-        try:
-            result = self.graph.invoke(
-                initial_state,
-                config={"recursion_limit": 50}  # Reduced limit
-            )
-            
-            return {
-                'company': company_name,
-                'url': cleaned_url,
-                'locations': result.get('final_locations', []),
-                'summary': result.get('summary', {}),
-                'enhancement_summary': {
-                    'workflow_type': 'simplified',
-                    'optimizations': [
-                        'Removed resource-heavy agents (SEC, MultiSearch, IndustrySpecific)',
-                        'Reduced search queries per agent',
-                        'Limited web scraping to 5 pages',
-                        'Basic deduplication only',
-                        'JSON export only'
-                    ],
-                    'expected_performance': 'Faster, more reliable, Railway-optimized'
-                },
-                'export_files': result.get('export_files', []),
-                'messages': [msg.content if hasattr(msg, 'content') else str(msg) 
-                           for msg in result.get('messages', [])],
-                'errors': result.get('errors', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"Simplified workflow error: {e}")
-            return {
-                'company': company_name,
-                'url': cleaned_url,
-                'locations': [],
-                'summary': {'error': str(e)},
-                'enhancement_summary': {'error': 'Workflow failed'},
-                'export_files': [],
-                'messages': [],
-                'errors': [str(e)]
-            }
+        if force_refresh:
+            # Input overwrites the checkpointed state, so clearing every output reruns each node on the same thread
+            state.update(dict.fromkeys(self.OUTPUT_KEYS))
+        
+        return state
+    
+    def _build_result(self, company_name: str, cleaned_url: str, result: Dict) -> Dict:
+        """Shape the final graph state into the discovery result"""
+        return {
+            'company': company_name,
+            'url': cleaned_url,
+            'locations': result.get('final_locations', []),
+            'summary': result.get('summary', {}),
+            'enhancement_summary': {
+                'workflow_type': 'simplified',
+                'optimizations': [
+                    'Removed resource-heavy agents (SEC, MultiSearch, IndustrySpecific)',
+                    'Reduced search queries per agent',
+                    'Limited web scraping to 5 pages',
+                    'Basic deduplication only',
+                    'JSON export only'
+                ],
+                'expected_performance': 'Faster, more reliable, Railway-optimized'
+            },
+            'export_files': result.get('export_files', []),
+            'messages': [getattr(msg, 'content', None) or str(msg) for msg in result.get('messages', ())],
+            'errors': result.get('errors', [])
+        }
+    
+    def _build_error_result(self, company_name: str, cleaned_url: str, error: Exception) -> Dict:
+        """Result returned when the workflow fails"""
+        return {
+            'company': company_name,
+            'url': cleaned_url,
+            'locations': [],
+            'summary': {'error': str(error)},
+            'enhancement_summary': {'error': 'Workflow failed'},
+            'export_files': [],
+            'messages': [],
+            'errors': [str(error)]
+        }
 
 
 # ===== ALIASES =====
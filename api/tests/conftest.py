@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Modules under api/ import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep the on-disk caches created at import time out of the working tree
+_cache_dir = tempfile.mkdtemp(prefix="discovery-tests-")
+os.environ.setdefault("LLM_CACHE_DIR", os.path.join(_cache_dir, "llm"))
+os.environ.setdefault("HTTP_CACHE_PATH", os.path.join(_cache_dir, "http"))
+os.environ.setdefault("CHECKPOINT_DB_PATH", os.path.join(_cache_dir, "checkpoints.db"))
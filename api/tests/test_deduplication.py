@@ -0,0 +1,66 @@
+import pytest
+
+from simplified_discovery_workflow import SimplifiedDeduplicationNode
+
+pytest.importorskip("rapidfuzz")
+
+
+def deduplicate(*locations):
+    return SimplifiedDeduplicationNode()._basic_deduplicate(list(locations))
+
+
+def test_vague_name_does_not_swallow_distinct_facility():
+    unique = deduplicate(
+        {'name': 'Acme Seattle', 'address': '100 Main St', 'city': 'Seattle'},
+        {'name': 'Acme Seattle Distribution Center', 'address': '100 Main St', 'city': 'Seattle'},
+    )
+    
+    assert [loc['name'] for loc in unique] == ['Acme Seattle', 'Acme Seattle Distribution Center']
+
+
+def test_suite_suffix_address_is_same_place():
+    unique = deduplicate(
+        {'name': 'Acme Corp', 'address': '100 Main St', 'city': 'Seattle'},
+        {'name': 'Acme Corporation', 'address': '100 Main St Ste 4', 'city': 'Seattle'},
+    )
+    
+    assert len(unique) == 1
+
+
+def test_matching_name_at_different_address_is_kept():
+    unique = deduplicate(
+        {'name': 'Acme Corp', 'address': '100 Main St', 'city': 'Seattle'},
+        {'name': 'Acme Corporation', 'address': '500 Pine St', 'city': 'Seattle'},
+    )
+    
+    assert [loc['address'] for loc in unique] == ['100 Main St', '500 Pine St']
+
+
+def test_missing_address_matches_same_name():
+    unique = deduplicate(
+        {'name': 'Acme Corp.', 'address': '', 'city': 'Seattle'},
+        {'name': 'Acme Corporation', 'address': '100 Main St', 'city': 'Seattle'},
+    )
+    
+    assert len(unique) == 1
+    assert unique[0]['address'] == '100 Main St'
+
+
+def test_richer_record_wins_tie():
+    unique = deduplicate(
+        {'name': 'Acme Corp', 'address': '100 Main St', 'city': 'Seattle'},
+        {'name': 'Acme Corp', 'address': '100 Main St', 'city': 'Seattle', 'phone': '206-555-0100'},
+        {'name': 'Acme Corp', 'address': '100 Main St', 'city': 'Seattle'},
+    )
+    
+    assert len(unique) == 1
+    assert unique[0]['phone'] == '206-555-0100'
+
+
+def test_longer_address_breaks_equal_field_count():
+    unique = deduplicate(
+        {'name': 'Acme Corp', 'address': '100 Main St', 'city': 'Seattle'},
+        {'name': 'Acme Corp', 'address': '100 Main St Ste 4', 'city': 'Seattle'},
+    )
+    
+    assert unique[0]['address'] == '100 Main St Ste 4'